@@ -1,18 +1,79 @@
 import os
 import argparse
+import logging
 import requests
 import re
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Tuple, Optional
 
+try:
+    # Optional: orjson parses the large media_files pages several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
 # ----------------- CONFIGURATION ------------------
 # Get API token from environment variables
 API_TOKEN = os.getenv("API_TOKEN")  # Must be set before running the script
 API_TOKEN_ID = os.getenv("API_TOKEN_ID")  # Must be set before running the script
 BASE_URL = os.getenv("BASE_URL", "https://api.skydio.com/api/v0")
 
+# Default number of DELETE requests kept in flight at once (override with --workers)
+MAX_DELETE_WORKERS = 32
+# Number of media_files pages fetched at once; kept low to stay clear of rate limits
+MAX_PAGE_WORKERS = 8
+# Log a deletion progress line every this many files (failures are always logged)
+PROGRESS_INTERVAL = 100
+# Log level for progress output; set LOG_LEVEL=DEBUG to log every deleted file
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+logger = logging.getLogger(__name__)
+
+
+def make_http_adapter(pool_maxsize: int) -> HTTPAdapter:
+    """Create a retrying adapter whose connection pool fits `pool_maxsize` concurrent requests."""
+    return HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+
+
+# Shared session so every API call reuses pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", make_http_adapter(MAX_DELETE_WORKERS))
+
 
 # ----------------- HELPER FUNCTIONS ------------------
+_TIME_DELTA_RE = re.compile(
+    r"^(\d+)\s*(d|day|days|w|week|weeks|m|month|months|sec|seconds|min|minutes|hr|hours)$"
+)
+
+_UNIT_TO_TIMEDELTA = {
+    **dict.fromkeys(("sec", "seconds"), lambda value: timedelta(seconds=value)),
+    **dict.fromkeys(("min", "minutes"), lambda value: timedelta(minutes=value)),
+    **dict.fromkeys(("hr", "hours"), lambda value: timedelta(hours=value)),
+    **dict.fromkeys(("d", "day", "days"), lambda value: timedelta(days=value)),
+    **dict.fromkeys(("w", "week", "weeks"), lambda value: timedelta(weeks=value)),
+    # Approximate months as 30 days
+    **dict.fromkeys(("m", "month", "months"), lambda value: timedelta(days=value * 30)),
+}
+
+
+def parse_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 def get_headers() -> dict:
     """Get headers for API requests."""
     if not API_TOKEN:
@@ -49,28 +110,17 @@ def parse_time_delta(time_str: str) -> Optional[timedelta]:
     time_str = time_str.strip().lower()
 
     # Match patterns like "14d", "14 days", "2w", "2 weeks", "3m", "3 months"
-    match = re.match(r"^(\d+)\s*(d|day|days|w|week|weeks|m|month|months|sec|seconds|min|minutes|hr|hours)$", time_str)
+    match = _TIME_DELTA_RE.match(time_str)
     if not match:
         return None  # Not a time delta format
 
     value = int(match.group(1))
     unit = match.group(2)
 
-    if unit in ("sec", "seconds"):
-        return timedelta(seconds=value)
-    elif unit in ("min", "minutes"):
-        return timedelta(minutes=value)
-    elif unit in ("hr", "hours"):
-        return timedelta(hours=value)
-    elif unit in ("d", "day", "days"):
-        return timedelta(days=value)
-    elif unit in ("w", "week", "weeks"):
-        return timedelta(weeks=value)
-    elif unit in ("m", "month", "months"):
-        # Approximate months as 30 days
-        return timedelta(days=value * 30)
-    else:
+    to_timedelta = _UNIT_TO_TIMEDELTA.get(unit)
+    if to_timedelta is None:
         raise ValueError(f"Unsupported time unit: {unit}")
+    return to_timedelta(value)
 
 
 def get_cutoff_datetime(before_str: str) -> datetime:
@@ -128,54 +178,111 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes:.2f} PB"
 
 
-def get_all_old_media_files(cutoff_datetime: datetime) -> List[Dict[str, Any]]:
+def parse_captured_time(captured_time: str) -> Optional[datetime]:
     """
-    Fetch all media files older than the cutoff datetime using pagination.
-
-    Args:
-        cutoff_datetime: Only fetch files captured before this time
+    Parse an API timestamp like '2024-10-25T14:30:00Z' into a naive UTC datetime.
 
     Returns:
-        List of media file dictionaries
+        datetime object, or None if the timestamp is missing or not ISO 8601
     """
-    all_files = []
-    page_number = 1
+    try:
+        parsed = datetime.fromisoformat(captured_time.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
-    cutoff_iso = cutoff_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    print(f"Fetching media files captured before {cutoff_iso}...")
+def fetch_media_page(cutoff_iso: str, page_number: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch a single page of media files captured before the cutoff.
 
-    while True:
-        url = f"{BASE_URL}/media_files"
-        params = {
-            "captured_before": cutoff_iso,
-            "per_page": 500,  # Max allowed per page
-            "page_number": page_number,
-        }
+    Args:
+        cutoff_iso: Cutoff time formatted as an ISO 8601 UTC string
+        page_number: 1-based page number to fetch
 
-        response = requests.get(url, headers=get_headers(), params=params)
-        response.raise_for_status()
+    Returns:
+        Tuple of (files on this page, reduced to uuid/size/kind/captured_time, pagination metadata)
+    """
+    url = f"{BASE_URL}/media_files"
+    params = {
+        "captured_before": cutoff_iso,
+        "per_page": 500,  # Max allowed per page
+        "page_number": page_number,
+    }
 
-        data = response.json().get("data", {})
-        files = data.get("files", [])
-        pagination = data.get("pagination", {})
+    response = SESSION.get(url, params=params)
+    response.raise_for_status()
+
+    data = parse_json(response).get("data", {})
+    # Keep only the fields this script uses so large sweeps don't hold full media records
+    files = [
+        {
+            "uuid": file["uuid"],
+            "size": file.get("size", 0),
+            "kind": file.get("kind", "unknown"),
+            "captured_time": file.get("captured_time", "unknown"),
+        }
+        for file in data.get("files", [])
+    ]
+    return files, data.get("pagination", {})
 
-        all_files.extend(files)
 
-        print(f"  Page {page_number}: Found {len(files)} files (total so far: {len(all_files)})")
+def get_all_old_media_files(cutoff_datetime: datetime) -> List[Dict[str, Any]]:
+    """
+    Fetch all media files older than the cutoff datetime using pagination.
 
-        # Check if there are more pages
-        current_page = pagination.get("current_page", page_number)
-        total_pages = pagination.get("total_pages", 1)
+    The first page is fetched on its own to learn the total page count; the
+    remaining pages are then fetched concurrently and combined in page order.
 
-        if current_page >= total_pages:
-            break
+    Args:
+        cutoff_datetime: Only fetch files captured before this time
 
-        page_number += 1
+    Returns:
+        List of media file dictionaries
+    """
+    cutoff_iso = cutoff_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    print(f"Total media files found: {len(all_files)}")
+    logger.info("Fetching media files captured before %s...", cutoff_iso)
+
+    files, pagination = fetch_media_page(cutoff_iso, 1)
+    all_files = list(files)
+    logger.info("  Page 1: Found %d files (total so far: %d)", len(files), len(all_files))
+
+    # Check if there are more pages
+    current_page = pagination.get("current_page", 1)
+    total_pages = pagination.get("total_pages", 1)
+
+    if current_page < total_pages:
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            pages = executor.map(
+                lambda page_number: fetch_media_page(cutoff_iso, page_number)[0],
+                range(current_page + 1, total_pages + 1),
+            )
+            for page_number, files in enumerate(pages, current_page + 1):
+                all_files.extend(files)
+                logger.info(
+                    "  Page %d: Found %d files (total so far: %d)",
+                    page_number, len(files), len(all_files),
+                )
+
+    logger.info("Total media files found: %d", len(all_files))
+
+    # Don't rely solely on the server-side filter before deleting anything: drop files whose
+    # capture time is known to be at or after the cutoff
+    too_new = 0
+    old_files = []
+    for file in all_files:
+        captured = parse_captured_time(file["captured_time"])
+        if captured is not None and captured >= cutoff_datetime:
+            too_new += 1
+        else:
+            old_files.append(file)
+    if too_new:
+        logger.warning("Skipping %d files captured at or after the cutoff", too_new)
 
-    return all_files
+    return old_files
 
 
 def delete_media_file(file_uuid: str) -> Tuple[bool, str]:
@@ -190,7 +297,7 @@ def delete_media_file(file_uuid: str) -> Tuple[bool, str]:
     """
     url = f"{BASE_URL}/media/{file_uuid}/delete"
     try:
-        response = requests.delete(url, headers=get_headers())
+        response = SESSION.delete(url)
         response.raise_for_status()
         return True, None
     except requests.exceptions.HTTPError as e:
@@ -202,6 +309,7 @@ def delete_media_file(file_uuid: str) -> Tuple[bool, str]:
 def delete_old_media_files(
     cutoff_datetime: datetime,
     dry_run: bool = True,
+    max_workers: int = MAX_DELETE_WORKERS,
 ) -> Tuple[int, int]:
     """
     Delete media files older than the cutoff datetime.
@@ -209,6 +317,7 @@ def delete_old_media_files(
     Args:
         cutoff_datetime: Delete files captured before this time
         dry_run: If True, only list files without deleting
+        max_workers: Maximum number of DELETE requests in flight at once
 
     Returns:
         Tuple of (deleted_count, failed_count)
@@ -219,8 +328,18 @@ def delete_old_media_files(
         print("No media files found to delete.")
         return 0, 0
 
-    # Calculate total size
-    total_size = sum(f.get("size", 0) for f in files)
+    # Calculate total size and, for a dry run, the file listing in a single pass
+    total_size = 0
+    dry_run_lines = []
+    for file in files:
+        size = file.get("size", 0)
+        total_size += size
+        if dry_run:
+            dry_run_lines.append(
+                f"  - {file['uuid']}: {file.get('kind', 'unknown')} "
+                f"({format_size(size)}) "
+                f"captured at {file.get('captured_time', 'unknown')}"
+            )
 
     print(f"\n{'DRY RUN: Would delete' if dry_run else 'Deleting'} {len(files)} media files")
     print(f"Total size: {format_size(total_size)}")
@@ -228,31 +347,36 @@ def delete_old_media_files(
 
     if dry_run:
         print(f"{len(files)} files that would be deleted:")
-        for file in files:
-            captured_time = file.get("captured_time", "unknown")
-            print(f"  - {file['uuid']}: {file.get('kind', 'unknown')} "
-                  f"({format_size(file.get('size', 0))}) "
-                  f"captured at {captured_time}")
+        print("\n".join(dry_run_lines))
 
         print(f"\nTo actually delete these files, re-run with --delete flag")
         return 0, 0
 
-    # Delete files one by one
+    # The API deletes one file per request (there is no batch delete endpoint), so keep
+    # many independent DELETEs in flight over the session's keep-alive connections
     deleted_count = 0
     failed_count = 0
 
-    print("Deleting files...")
-    for i, file in enumerate(files, 1):
-        file_uuid = file["uuid"]
+    logger.info("Deleting files...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(delete_media_file, file["uuid"]): file["uuid"]
+            for file in files
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            file_uuid = futures[future]
+            success, error = future.result()
 
-        success, error = delete_media_file(file_uuid)
+            if success:
+                deleted_count += 1
+                logger.debug("Deleted %s", file_uuid)
+            else:
+                logger.warning("  [%d/%d] ✗ Failed to delete %s: %s", i, len(files), file_uuid, error)
+                failed_count += 1
 
-        if success:
-            print(f"  [{i}/{len(files)}] ✓ Deleted {file_uuid}")
-            deleted_count += 1
-        else:
-            print(f"  [{i}/{len(files)}] ✗ Failed to delete {file_uuid}: {error}")
-            failed_count += 1
+            # Report progress periodically rather than once per file
+            if i % PROGRESS_INTERVAL == 0 or i == len(files):
+                logger.info("  [%d/%d] %d deleted, %d failed", i, len(files), deleted_count, failed_count)
 
     return deleted_count, failed_count
 
@@ -276,6 +400,9 @@ Examples:
   # Delete media captured before a specific date (uses local timezone at 00:00:00)
   python main.py --before 2024-01-15 --delete
 
+  # Keep fewer deletes in flight on a slow or rate-limited connection
+  python main.py --before 30d --delete --workers 8
+
 Time formats:
   14d or 14 days    - 14 days ago
   2w or 2 weeks     - 2 weeks ago
@@ -306,8 +433,19 @@ Environment variables required:
         action="store_true",
         help="Actually delete the media (default is dry-run mode)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_DELETE_WORKERS,
+        help=f"Number of delete requests to run concurrently (default: {MAX_DELETE_WORKERS})",
+    )
     args = parser.parse_args()
 
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     # Parse the time delta
     try:
         cutoff_datetime = get_cutoff_datetime(args.before)
@@ -329,9 +467,14 @@ Environment variables required:
         print()
 
     try:
+        # Authenticate the shared session once and size its pool for the requested concurrency
+        SESSION.headers.update(get_headers())
+        SESSION.mount("https://", make_http_adapter(max(args.workers, MAX_PAGE_WORKERS)))
+
         deleted, failed = delete_old_media_files(
             cutoff_datetime,
             dry_run=not args.delete,
+            max_workers=args.workers,
         )
 
         # Summary
@@ -7,4 +7,7 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0"],
+    },
 )
@@ -1,11 +1,36 @@
 import os
 import argparse
+import logging
+import shutil
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ----------------- CONFIGURATION ------------------
 # Get API token from environment variable
 API_TOKEN = os.getenv("API_TOKEN")  # Must be set before running the script
 BASE_URL = "https://api.skydio.com/api/v0"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB reads/writes when streaming media to disk
+MAX_DOWNLOAD_WORKERS = 8  # Files downloaded at once; tune to the available bandwidth
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+logger = logging.getLogger(__name__)
+
+# Shared session so every API call reuses pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
 
 
 # ----------------- HELPER FUNCTIONS ------------------
@@ -18,7 +43,7 @@ def get_headers() -> dict:
 
 def get_vehicle_by_serial(serial: str) -> dict:
     url = f"{BASE_URL}/vehicle/{serial}"
-    response = requests.get(url, headers=get_headers())
+    response = SESSION.get(url)
     response.raise_for_status()
     return response.json().get("data", {}).get("vehicle", {})
 
@@ -26,7 +51,7 @@ def get_vehicle_by_serial(serial: str) -> dict:
 def get_latest_flight(vehicle_serial: str) -> dict:
     url = f"{BASE_URL}/flights"
     params = {"vehicle_serial": vehicle_serial}
-    response = requests.get(url, headers=get_headers(), params=params)
+    response = SESSION.get(url, params=params)
     response.raise_for_status()
     flights = response.json().get("data", {}).get("flights", [])
     if not flights:
@@ -37,27 +62,58 @@ def get_latest_flight(vehicle_serial: str) -> dict:
 def get_flight_media(flight_id: str) -> list:
     url = f"{BASE_URL}/media_files"
     params = {"flight_id": flight_id}
-    response = requests.get(url, headers=get_headers(), params=params)
+    response = SESSION.get(url, params=params)
     response.raise_for_status()
     return response.json().get("data", {}).get("files", [])
 
 
 def download_file(file_uuid: str, filename: str) -> None:
     url = f"{BASE_URL}/media/download/{file_uuid}"
-    response = requests.get(url, stream=True, headers=get_headers())
-    response.raise_for_status()
-    with open(filename, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    with SESSION.get(url, stream=True) as response:
+        response.raise_for_status()
+        # Let urllib3 undo any Content-Encoding, then copy in large blocks
+        response.raw.decode_content = True
+        with open(filename, "wb") as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
 
 def delete_file(file_uuid: str) -> dict:
     url = f"{BASE_URL}/media/{file_uuid}/delete"
-    response = requests.delete(url, headers=get_headers())
+    response = SESSION.delete(url)
     response.raise_for_status()
     return response.json()
 
 
+def unique_file_names(media_files: list) -> list:
+    """Pick a local file name for each media file, adding the uuid to names already taken.
+
+    Files are downloaded concurrently, so two files sharing a name must not share a path.
+    """
+    names = []
+    taken = set()
+    for file in media_files:
+        file_uuid = file["uuid"]
+        file_name = file.get("filename", f"media_{file_uuid}")
+        if file_name in taken:
+            stem, ext = os.path.splitext(file_name)
+            file_name = f"{stem}_{file_uuid}{ext}"
+        taken.add(file_name)
+        names.append(file_name)
+    return names
+
+
+def download_media_file(
+    file: dict, file_name: str, output_directory: str, delete_after_download: bool
+) -> str:
+    """Download one media file, then delete it from Skydio Cloud if requested."""
+    file_uuid = file["uuid"]
+    download_file(file_uuid, os.path.join(output_directory, file_name))
+
+    if delete_after_download:
+        delete_file(file_uuid)
+    return file_name
+
+
 # ----------------- MAIN SCRIPT ------------------
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -80,38 +136,59 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(message)s")
+
     os.makedirs(args.output_directory, exist_ok=True)
 
+    # Authenticate the shared session once for all subsequent requests
+    SESSION.headers.update(get_headers())
+
     # Make sure the vehicle exists
-    print(f"Getting vehicle with serial '{args.vehicle_serial}'...")
+    logger.info("Getting vehicle with serial '%s'...", args.vehicle_serial)
     vehicle = get_vehicle_by_serial(args.vehicle_serial)
     if not vehicle:
-        print(f"Vehicle with serial '{args.vehicle_serial}' not found.")
+        logger.error("Vehicle with serial '%s' not found.", args.vehicle_serial)
         return
 
-    print("Getting most recent flight...")
+    logger.info("Getting most recent flight...")
     flight = get_latest_flight(args.vehicle_serial)
     flight_id = flight["flight_id"]
-    print(f"Flight ID: {flight_id} - Started at {flight['takeoff']}")
+    logger.info("Flight ID: %s - Started at %s", flight_id, flight["takeoff"])
 
-    print("Fetching media files...")
+    logger.info("Fetching media files...")
     media_files = get_flight_media(flight_id)
     if not media_files:
-        print("No media files found for this flight.")
+        logger.info("No media files found for this flight.")
         return
 
-    for file in media_files:
-        file_uuid = file["uuid"]
-        file_name = file.get("filename", f"media_{file_uuid}")
-        local_path = os.path.join(args.output_directory, file_name)
-        print(f"Downloading {file_name}...")
-        download_file(file_uuid, local_path)
-
-        if args.delete_downloaded_files:
-            print(f"Deleting {file_name} from Skydio Cloud...")
-            delete_file(file_uuid)
-
-    print(f"\nDownload complete! Files saved in '{args.output_directory}'")
+    logger.info("Downloading %d files...", len(media_files))
+    file_names = unique_file_names(media_files)
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                download_media_file,
+                file,
+                file_name,
+                args.output_directory,
+                args.delete_downloaded_files,
+            )
+            for file, file_name in zip(media_files, file_names)
+        ]
+        try:
+            for future in as_completed(futures):
+                file_name = future.result()
+                if args.delete_downloaded_files:
+                    logger.info("Downloaded %s and deleted it from Skydio Cloud", file_name)
+                else:
+                    logger.info("Downloaded %s", file_name)
+        except BaseException:
+            # Stop at the first failure: drop queued downloads (and their deletes) instead of
+            # waiting for all of them on the way out of the executor
+            for future in futures:
+                future.cancel()
+            raise
+
+    logger.info("Download complete! Files saved in '%s'", args.output_directory)
 
 
 if __name__ == "__main__":
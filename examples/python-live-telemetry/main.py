@@ -1,16 +1,34 @@
 from fastapi import FastAPI, Request
 import asyncio
+import functools
 import websockets
 import json
 import os
 
+# orjson parses telemetry messages several times faster than the stdlib json module; it is
+# optional and json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = FastAPI()
 
 # Get the API token secret from an environment variable
 API_TOKEN_SECRET = os.getenv("API_TOKEN_SECRET")
 
-# Store active websocket tasks per vehicle
-active_telemetry_connections = {}
+# Print one telemetry message out of every TELEMETRY_PRINT_INTERVAL (at least 1, i.e. every
+# message); pretty-printing every message at the telemetry rate would dominate CPU and flood
+# the console
+TELEMETRY_PRINT_INTERVAL = max(1, int(os.getenv("TELEMETRY_PRINT_INTERVAL", "20")))
+
+# Keepalive pings every WS_PING_INTERVAL_S; the connection is treated as dropped if a pong
+# doesn't arrive within WS_PING_TIMEOUT_S, so a stalled network is noticed in seconds
+WS_PING_INTERVAL_S = 5
+WS_PING_TIMEOUT_S = 5
+
+# Store active websocket tasks per vehicle; each task removes itself when it finishes
+active_telemetry_connections = {}  # vehicle_serial: asyncio.Task
 
 
 @app.post("/webhook")
@@ -29,25 +47,61 @@ async def receive_webhook(request: Request):
     print(f"Received event: {event_type} for vehicle: {vehicle_serial}")
     print(f"Stream status: {live_stream_status}")
 
-    if live_stream_status == "LIVE_STREAM_START":
-        if vehicle_serial in active_telemetry_connections:
-            print(f"Restarting telemetry connection for {vehicle_serial}")
-            active_telemetry_connections[vehicle_serial].cancel()
+    handler = TELEMETRY_STATUS_HANDLERS.get(live_stream_status)
+    if handler is not None:
+        handler(vehicle_serial)
+
+    return {"status": "received"}
 
-        ws_url_with_auth = build_ws_url(vehicle_serial)
-        task = asyncio.create_task(
-            connect_to_telemetry_ws(vehicle_serial, ws_url_with_auth)
-        )
-        active_telemetry_connections[vehicle_serial] = task
 
-    elif live_stream_status == "LIVE_STREAM_STOP":
-        print(f"Stopping telemetry for {vehicle_serial}")
-        task = active_telemetry_connections.get(vehicle_serial)
-        if task and not task.done():
-            task.cancel()
-        active_telemetry_connections.pop(vehicle_serial, None)
+def on_stream_start(vehicle_serial: str):
+    if vehicle_serial in active_telemetry_connections:
+        print(f"Restarting telemetry connection for {vehicle_serial}")
+        active_telemetry_connections[vehicle_serial].cancel()
 
-    return {"status": "received"}
+    ws_url_with_auth = build_ws_url(vehicle_serial)
+    task = asyncio.create_task(
+        connect_to_telemetry_ws(vehicle_serial, ws_url_with_auth)
+    )
+    active_telemetry_connections[vehicle_serial] = task
+    # Drop the entry however the task ends (closed socket, error, cancel) so finished
+    # connections don't accumulate over a long uptime
+    task.add_done_callback(functools.partial(forget_telemetry_task, vehicle_serial))
+
+
+def on_stream_stop(vehicle_serial: str):
+    print(f"Stopping telemetry for {vehicle_serial}")
+    task = active_telemetry_connections.pop(vehicle_serial, None)
+    if task:
+        task.cancel()  # No-op if the task already finished
+
+
+# Live stream status -> handler; statuses not listed here are ignored
+TELEMETRY_STATUS_HANDLERS = {
+    "LIVE_STREAM_START": on_stream_start,
+    "LIVE_STREAM_STOP": on_stream_stop,
+}
+
+
+def load_json(message):
+    """Parse a JSON message (str or bytes)"""
+    if orjson is not None:
+        return orjson.loads(message)
+    return json.loads(message)
+
+
+def format_json(data):
+    """Serialize data as JSON indented by two spaces"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2)
+
+
+def forget_telemetry_task(vehicle_serial: str, task: asyncio.Task):
+    # Only remove the entry if it still refers to this task, not to a newer connection that
+    # replaced it on restart
+    if active_telemetry_connections.get(vehicle_serial) is task:
+        del active_telemetry_connections[vehicle_serial]
 
 
 def build_ws_url(vehicle_serial: str):
@@ -65,12 +119,21 @@ def build_ws_url(vehicle_serial: str):
 async def connect_to_telemetry_ws(vehicle_serial: str, ws_url: str):
     print(f"Connecting to telemetry websocket: {ws_url}")
     try:
-        async with websockets.connect(ws_url) as websocket:
+        # Telemetry messages are small JSON, so per-message deflate costs more CPU than it saves
+        async with websockets.connect(
+            ws_url,
+            ping_interval=WS_PING_INTERVAL_S,
+            ping_timeout=WS_PING_TIMEOUT_S,
+            compression=None,
+        ) as websocket:
             print(f"Connected to telemetry for {vehicle_serial}")
+            message_count = 0
             while True:
                 message = await websocket.recv()
-                data = json.loads(message)
-                print(f"[{vehicle_serial}] Telemetry:", json.dumps(data, indent=2))
+                data = load_json(message)
+                if message_count % TELEMETRY_PRINT_INTERVAL == 0:
+                    print(f"[{vehicle_serial}] Telemetry:", format_json(data))
+                message_count += 1
     except asyncio.CancelledError:
         print(f"Telemetry websocket task for {vehicle_serial} was cancelled.")
     except Exception as e:
@@ -5,20 +5,38 @@ import requests
 
 class SkydioAPIClient(object):
     """
-    Simple client for interacting with the Skydio API, utilizing the requests library
+    Simple client for interacting with the Skydio API, utilizing the requests library.
+    Can be used as a context manager to close its connections when done.
     """
 
     def __init__(self, api_token, url="https://api.skydio.com/api"):
         # type: (str, str) -> None
         self.api_token = api_token
         self.url = url
+        # Built once; the session below sends them with every request
+        self._auth_headers = {
+            "Accept": "application/json",
+            "Authorization": "ApiToken " + api_token,
+        }
+        # One session for all calls so requests reuse the same keep-alive connection
+        self._session = requests.Session()
+        self._session.headers.update(self._auth_headers)
+
+    def __enter__(self):
+        # type: () -> SkydioAPIClient
+        return self
+
+    def __exit__(self, *exc_info):
+        # type: (T.Any) -> None
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        self._session.close()
 
     def api_token_header(self):
         # type: () -> T.Dict
-        return {
-            "Accept": "application/json",
-            "Authorization": "ApiToken " + self.api_token,
-        }
+        return self._auth_headers
 
     def get(self, endpoint, **kwargs):
         # type: (str, T.Any) -> T.Dict[str, T.Any]
@@ -34,8 +52,6 @@ class SkydioAPIClient(object):
 
     def _request(self, method, endpoint, **kwargs):
         # type: (str, str, T.Any) -> T.Dict[str, T.Any]
-        headers = kwargs.setdefault("headers", {})
-        headers.update(self.api_token_header())
-        resp = requests.request(method, self.url + endpoint, **kwargs)
+        resp = self._session.request(method, self.url + endpoint, **kwargs)
         resp.raise_for_status()
         return resp.json()
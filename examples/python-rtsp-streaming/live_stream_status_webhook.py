@@ -27,8 +27,8 @@ under Settings -> Devices -> Your vehicle -> Connectivity -> Streaming.
 """
 
 from uuid import uuid4
+from datetime import datetime, timezone
 import argparse
-import arrow
 import requests
 
 # URL of the webhook server
@@ -57,7 +57,7 @@ def get_payload(status, stream_type, vehicle_serial):
                 "vehicle_serial": vehicle_serial,
             }
         },
-        "event_time": arrow.utcnow().isoformat(),  # Current time in ISO format
+        "event_time": datetime.now(timezone.utc).isoformat(),  # Current time in ISO format
         "event_type": "skydio.cloud.event.live_stream_status_changed",
         "id": str(uuid4()),
     }
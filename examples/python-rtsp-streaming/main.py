@@ -1,31 +1,66 @@
-from fastapi import FastAPI, Request
+from fastapi import BackgroundTasks, FastAPI, Request
 from urllib.parse import urlparse, urlunparse
+from collections import defaultdict
+import asyncio
+import functools
+import logging
+import queue
 import threading
 import cv2
-import time
+import random
 import uvicorn
 import os
 
 app = FastAPI()
 
+# Decoder threads log through the logging module so their lines don't interleave mid-message
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s [%(threadName)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
 # Get credentials from environment variables
 api_token = os.getenv("API_TOKEN")
 api_token_id = os.getenv("API_TOKEN_ID")
 
 # Track stream threads and stop signals per vehicle
 active_streams = {}  # vehicle_serial: {"thread": Thread, "stop_event": Event}
+# Serializes START/STOP handling per vehicle
+stream_locks = defaultdict(asyncio.Lock)  # vehicle_serial: asyncio.Lock
 
 # Toggle GUI mode (True = use cv2.imshow, False = headless)
 USE_GUI_STREAMING = os.getenv("USE_GUI_STREAMING", "false").lower() == "true"
 
+# In headless mode, decode one frame out of every FRAME_SAMPLE_INTERVAL frames
+FRAME_SAMPLE_INTERVAL = 30
+
+# In GUI mode, frames are read on a background thread into a queue holding at most this many;
+# when the display falls behind, the oldest queued frame is dropped so the decoder never stalls
+FRAME_QUEUE_SIZE = 2
+
+# Reconnect backoff: the delay doubles after each failed attempt (with +/-50% jitter), up to the
+# cap. Both the delay and the retry count reset once frames are flowing again, so max_retries
+# limits consecutive failures rather than reconnects over the stream's whole lifetime.
+RECONNECT_INITIAL_DELAY_S = 0.5
+RECONNECT_MAX_DELAY_S = 30.0
+
+# FFmpeg options for RTSP captures: TCP transport avoids UDP packet-loss stalls on lossy links,
+# and a small demuxer delay/buffer keeps the capture close to live. Must be set before any
+# cv2.VideoCapture is created; an explicitly exported value takes precedence.
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "rtsp_transport;tcp|max_delay;500000|buffer_size;102400",
+)
+
 
 @app.post("/webhook")
-async def receive_webhook(request: Request):
+async def receive_webhook(request: Request, background_tasks: BackgroundTasks):
     payload = await request.json()
 
     event_type = payload.get("event_type")
     if event_type != "skydio.cloud.event.live_stream_status_changed":
-        print(f"Unsupported event type: {event_type}")
+        logger.warning("Unsupported event type: %s", event_type)
         return {"status": "ignored"}
 
     webhook_data = payload.get("data", {}).get("resource", {})
@@ -34,41 +69,80 @@ async def receive_webhook(request: Request):
     stream_type = webhook_data.get("stream_type")
     vehicle_serial = webhook_data.get("vehicle_serial")
 
-    print(f"Received event: {event_type} for vehicle: {vehicle_serial}")
-    print(f"Stream status: {live_stream_status}, stream type: {stream_type}")
+    logger.info("Received event: %s for vehicle: %s", event_type, vehicle_serial)
+    logger.info("Stream status: %s, stream type: %s", live_stream_status, stream_type)
 
-    if live_stream_status == "LIVE_STREAM_START" and rtsp_url:
-        print(f"RTSP Stream Available at: {rtsp_url}")
-        stream_url_with_creds = parse_stream_url_and_inject_credentials(rtsp_url)
+    # Acknowledge right away; stopping a previous stream can take seconds (its thread has to
+    # finish a blocking read), and a slow response makes the webhook sender retry
+    background_tasks.add_task(
+        handle_stream_status, vehicle_serial, live_stream_status, rtsp_url
+    )
+    return {"status": "received"}
 
-        # Start new stream and store task
-        if vehicle_serial in active_streams:
-            print(f"Stopping existing stream for {vehicle_serial}")
-            active_streams[vehicle_serial]["stop_event"].set()
-            active_streams[vehicle_serial]["thread"].join()
-            active_streams.pop(vehicle_serial)
 
-        stop_event = threading.Event()
-        thread = threading.Thread(
-            target=start_stream_gui if USE_GUI_STREAMING else start_stream_headless,
-            args=(stream_url_with_creds, stop_event),
-        )
-        thread.start()
-
-        active_streams[vehicle_serial] = {"thread": thread, "stop_event": stop_event}
-
-    elif live_stream_status == "LIVE_STREAM_STOP":
-        print(f"Stopping stream for vehicle: {vehicle_serial}")
-        stream_info = active_streams.get(vehicle_serial)
-        if stream_info:
-            stream_info["stop_event"].set()
-            stream_info["thread"].join()
-            print(f"Stream for {vehicle_serial} canceled.")
-            active_streams.pop(vehicle_serial)
-        else:
-            print(f"No active stream found for {vehicle_serial}")
+async def handle_stream_status(vehicle_serial: str, live_stream_status: str, rtsp_url: str):
+    """
+    Starts or stops the vehicle's stream for a live stream status change.
+    """
+    handler = STREAM_STATUS_HANDLERS.get(live_stream_status)
+    if handler is None:
+        return
 
-    return {"status": "received"}
+    # Handle one status change per vehicle at a time so concurrent webhooks can't race
+    async with stream_locks[vehicle_serial]:
+        await handler(vehicle_serial, rtsp_url)
+
+
+async def on_stream_start(vehicle_serial: str, rtsp_url: str):
+    if not rtsp_url:
+        return
+
+    logger.info("RTSP Stream Available at: %s", rtsp_url)
+    stream_url_with_creds = parse_stream_url_and_inject_credentials(rtsp_url)
+
+    # Start new stream and store task
+    if vehicle_serial in active_streams:
+        logger.info("Stopping existing stream for %s", vehicle_serial)
+        await stop_active_stream(vehicle_serial)
+
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=start_stream_gui if USE_GUI_STREAMING else start_stream_headless,
+        args=(stream_url_with_creds, stop_event),
+    )
+    thread.start()
+
+    active_streams[vehicle_serial] = {"thread": thread, "stop_event": stop_event}
+
+
+async def on_stream_stop(vehicle_serial: str, rtsp_url: str):
+    logger.info("Stopping stream for vehicle: %s", vehicle_serial)
+    if await stop_active_stream(vehicle_serial):
+        logger.info("Stream for %s canceled.", vehicle_serial)
+    else:
+        logger.warning("No active stream found for %s", vehicle_serial)
+
+
+# Live stream status -> handler; statuses not listed here are ignored
+STREAM_STATUS_HANDLERS = {
+    "LIVE_STREAM_START": on_stream_start,
+    "LIVE_STREAM_STOP": on_stream_stop,
+}
+
+
+async def stop_active_stream(vehicle_serial: str) -> bool:
+    """
+    Signals the vehicle's stream thread to stop and waits for it to exit.
+    The join runs in a worker thread so the event loop keeps serving other webhooks meanwhile.
+    Returns False if the vehicle had no active stream.
+    """
+    stream_info = active_streams.pop(vehicle_serial, None)
+    if not stream_info:
+        return False
+
+    stream_info["stop_event"].set()
+    await asyncio.get_running_loop().run_in_executor(None, stream_info["thread"].join)
+    return True
 
 
 def parse_stream_url_and_inject_credentials(rtsp_url: str):
@@ -80,53 +154,140 @@ def parse_stream_url_and_inject_credentials(rtsp_url: str):
     Output: rtsps://<api_token_id>:<api_token_secret>@stream.skydio.com/<skydio_serial>/<stream_name>
     """
     if not api_token or not api_token_id:
-        print("API token or token ID is missing. Returning original RTSP URL.")
+        logger.warning("API token or token ID is missing. Returning original RTSP URL.")
         return rtsp_url
 
+    return _inject_credentials(rtsp_url, api_token_id, api_token)
+
+
+@functools.lru_cache(maxsize=1024)
+def _inject_credentials(rtsp_url: str, token_id: str, token: str) -> str:
+    # Cached per (URL, credentials), so a rotated token produces a fresh entry
     parsed = urlparse(rtsp_url)
-    netloc_with_credentials = f"{api_token_id}:{api_token}@{parsed.netloc}"
+    netloc_with_credentials = f"{token_id}:{token}@{parsed.netloc}"
     return urlunparse(parsed._replace(netloc=netloc_with_credentials))
 
 
+def open_video_capture(rtsp_url: str) -> cv2.VideoCapture:
+    """
+    Opens the RTSP stream with the FFmpeg backend, requesting hardware-accelerated decoding
+    (NVDEC, VAAPI, VideoToolbox, ...) when the installed OpenCV supports it (4.5.2+).
+    OpenCV falls back to software decoding when no accelerator is available.
+    The internal frame buffer is capped at one frame so reads return the freshest frame.
+    """
+    cap = None
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(
+            rtsp_url,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+        if cap.isOpened():
+            if cap.get(cv2.CAP_PROP_HW_ACCELERATION) == cv2.VIDEO_ACCELERATION_NONE:
+                logger.info("Hardware decoding unavailable, using software decoding.")
+        else:
+            cap.release()
+            cap = None
+
+    if cap is None:
+        cap = cv2.VideoCapture(rtsp_url)
+
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def wait_before_reconnect(stop_event: threading.Event, backoff: float) -> float:
+    """
+    Waits about `backoff` seconds (+/-50% jitter) before the next reconnect attempt, returning
+    early if the stream is stopped. Returns the backoff to use for the following attempt.
+    """
+    stop_event.wait(backoff * random.uniform(0.5, 1.5))
+    return min(backoff * 2, RECONNECT_MAX_DELAY_S)
+
+
+def put_latest(frames: queue.Queue, item):
+    """Puts item on the bounded queue, dropping the oldest entry if the queue is full."""
+    while True:
+        try:
+            frames.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def read_frames(cap: cv2.VideoCapture, frames: queue.Queue, stop_event: threading.Event):
+    """
+    Reads frames from the capture into `frames` until the stream is stopped or a read fails,
+    then puts None to tell the consumer the stream ended.
+    """
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        put_latest(frames, frame)
+    put_latest(frames, None)
+
+
 def start_stream_gui(rtsp_url: str, stop_event: threading.Event, max_retries: int = 5):
     """
     Connects to the RTSP stream and displays it using OpenCV GUI (cv2.imshow).
-    Automatically retries on failure.
+    Automatically retries on failure, giving up after max_retries consecutive failed attempts.
     """
     retries = 0
+    backoff = RECONNECT_INITIAL_DELAY_S
     while retries < max_retries and not stop_event.is_set():
-        cap = cv2.VideoCapture(rtsp_url)
+        cap = open_video_capture(rtsp_url)
 
         if not cap.isOpened():
-            print("Failed to open RTSP stream. Retrying...")
+            logger.warning("Failed to open RTSP stream. Retrying...")
             retries += 1
-            time.sleep(2)
+            backoff = wait_before_reconnect(stop_event, backoff)
             continue
 
-        print("Opening RTSP stream (GUI)...")
-        while cap.isOpened() and not stop_event.is_set():
-            ret, frame = cap.read()
-            if not ret:
-                print("Failed to read frame from RTSP stream.")
+        logger.info("Opening RTSP stream (GUI)...")
+        # cap.read() blocks on the network, so it runs on its own thread and a slow
+        # imshow/waitKey never holds up decoding
+        frames = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        reader = threading.Thread(
+            target=read_frames,
+            args=(cap, frames, stop_event),
+            name=f"{threading.current_thread().name}-reader",
+            daemon=True,
+        )
+        reader.start()
+        while not stop_event.is_set():
+            try:
+                frame = frames.get(timeout=1)
+            except queue.Empty:
+                continue
+            if frame is None:
+                logger.warning("Failed to read frame from RTSP stream.")
                 break
+            backoff = RECONNECT_INITIAL_DELAY_S
+            retries = 0
 
             cv2.imshow("Skydio RTSP Stream", frame)
             if cv2.waitKey(1) & 0xFF == ord("q"):
-                print("User requested stop (pressed 'q').")
+                logger.info("User requested stop (pressed 'q').")
                 stop_event.set()
                 break
 
+        # The reader must be done with the capture before it is released
+        reader.join()
         cap.release()
         cv2.destroyAllWindows()
         if not stop_event.is_set():
-            print("Stream closed unexpectedly. Retrying...")
+            logger.warning("Stream closed unexpectedly. Retrying...")
             retries += 1
-            time.sleep(2)
+            backoff = wait_before_reconnect(stop_event, backoff)
         else:
             break
 
     if retries >= max_retries:
-        print("Maximum retries reached. Giving up on stream.")
+        logger.error("Maximum retries reached. Giving up on stream.")
 
 
 def start_stream_headless(
@@ -135,42 +296,49 @@ def start_stream_headless(
     """
     Connects to the RTSP stream and processes frames in headless mode (no GUI).
     Runs continuously until cancelled externally (via webhook).
-    Automatically retries on failure.
+    Automatically retries on failure, giving up after max_retries consecutive failed attempts.
     """
     retries = 0
+    backoff = RECONNECT_INITIAL_DELAY_S
+    frame_count = 0
     while retries < max_retries and not stop_event.is_set():
-        cap = cv2.VideoCapture(rtsp_url)
+        cap = open_video_capture(rtsp_url)
 
         if not cap.isOpened():
-            print("Failed to open RTSP stream. Retrying...")
+            logger.warning("Failed to open RTSP stream. Retrying...")
             retries += 1
-            time.sleep(2)
+            backoff = wait_before_reconnect(stop_event, backoff)
             continue
 
-        print("Streaming frames (headless mode)...")
+        logger.info("Streaming frames (headless mode)...")
         frame_count = 0
 
         while cap.isOpened() and not stop_event.is_set():
-            ret, frame = cap.read()
-            if not ret:
-                print("Failed to read frame from RTSP stream.")
+            # grab() advances the stream without the BGR conversion and copy done by read()
+            if not cap.grab():
+                logger.warning("Failed to read frame from RTSP stream.")
                 break
+            backoff = RECONNECT_INITIAL_DELAY_S
+            retries = 0
 
             frame_count += 1
-            if frame_count % 30 == 0:
-                print(f"Processed {frame_count} frames...")
+            if frame_count % FRAME_SAMPLE_INTERVAL == 0:
+                # Only materialize the frames that are actually processed
+                ret, frame = cap.retrieve()
+                if ret:
+                    logger.info("Processed %d frames...", frame_count)
 
         cap.release()
         if not stop_event.is_set():
-            print("Stream closed unexpectedly. Retrying...")
+            logger.warning("Stream closed unexpectedly. Retrying...")
             retries += 1
-            time.sleep(2)
+            backoff = wait_before_reconnect(stop_event, backoff)
         else:
             break
 
-    print("Headless stream closed after", frame_count, "frames.")
+    logger.info("Headless stream closed after %d frames.", frame_count)
     if retries >= max_retries:
-        print("Maximum retries reached. Giving up on stream.")
+        logger.error("Maximum retries reached. Giving up on stream.")
 
 
 if __name__ == "__main__":
@@ -7,13 +7,27 @@ It supports both pre-built JAR (default, faster) and building from source option
 """
 
 import argparse
+import hashlib
+import http.client
+import json
 import os
+import re
+import shlex
 import subprocess
 import sys
+import urllib.error
 import urllib.request
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# orjson serializes the multi-megabyte spec several times faster than the stdlib json module;
+# it is optional and json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def find_java_home():
     """Find and set JAVA_HOME on macOS"""
@@ -30,22 +44,98 @@ def find_java_home():
         sys.exit(1)
 
 
+# Number of byte ranges fetched in parallel when the server supports HTTP range requests
+DOWNLOAD_PARTS = 4
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class RangeNotSupported(Exception):
+    """Raised when the server ignores a Range header and returns the whole file"""
+
+
+class IncompleteRange(Exception):
+    """Raised when a byte range ends before all of its bytes were received"""
+
+
+def download_range(url, filename, start, end):
+    """Download bytes [start, end] of url into the same offsets of an existing file"""
+    req = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    with urllib.request.urlopen(req) as response:
+        if response.status != 206:
+            raise RangeNotSupported(f"Expected 206 Partial Content, got {response.status}")
+        written = 0
+        with open(filename, "r+b") as f:
+            f.seek(start)
+            while True:
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+    # The file is preallocated, so a short part would otherwise leave a zero-filled hole
+    if written != end - start + 1:
+        raise IncompleteRange(f"Got {written} of {end - start + 1} bytes for range {start}-{end}")
+
+
+def download_file_in_parts(url, filename, parts=DOWNLOAD_PARTS):
+    """
+    Download a file as parallel byte ranges over several connections.
+
+    Returns False if the server doesn't advertise range support or any part fails, so the
+    caller can fall back to a single-stream download.
+    """
+    head = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(head) as response:
+            size = int(response.headers.get("Content-Length") or 0)
+            accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    except urllib.error.URLError:
+        return False
+    if not accepts_ranges or size < parts:
+        return False
+
+    # Preallocate the file so each part can be written at its own offset
+    with open(filename, "wb") as f:
+        f.truncate(size)
+
+    part_size = -(-size // parts)
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    with ThreadPoolExecutor(max_workers=parts) as executor:
+        futures = [executor.submit(download_range, url, filename, start, end) for start, end in ranges]
+        try:
+            for future in futures:
+                future.result()
+        except (RangeNotSupported, IncompleteRange, http.client.HTTPException, OSError) as e:
+            for future in futures:
+                future.cancel()
+            print(f"Parallel download failed ({e}), retrying as a single download")
+            return False
+    return True
+
+
 def download_file(url, filename):
     """Download a file from URL with progress indication"""
     print(f"Downloading {filename}...")
     try:
-        urllib.request.urlretrieve(url, filename)
+        if not download_file_in_parts(url, filename):
+            # urlretrieve rewrites the whole file and raises if it ends up short
+            urllib.request.urlretrieve(url, filename)
         print(f"Downloaded {filename} successfully")
     except Exception as e:
+        # Don't leave a partial file behind, it would be mistaken for a cached download
+        if os.path.exists(filename):
+            os.remove(filename)
         print(f"Error downloading {filename}: {e}")
         sys.exit(1)
 
 
 def run_command(cmd, cwd=None, check=True):
-    """Run a shell command"""
-    print(f"Running: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
+    """Run a command given as an argument list (executed directly, without a shell)"""
+    if not isinstance(cmd, list):
+        raise TypeError("run_command expects a list of arguments")
+    print(f"Running: {shlex.join(cmd)}")
     try:
-        result = subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+        result = subprocess.run(cmd, cwd=cwd, check=check)
         return result
     except subprocess.CalledProcessError as e:
         print(f"Command failed with exit code {e.returncode}")
@@ -54,6 +144,27 @@ def run_command(cmd, cwd=None, check=True):
         return e
 
 
+def fetch_maven_sha1(url):
+    """Fetch the SHA-1 that Maven Central publishes next to an artifact, or None if unavailable"""
+    try:
+        with urllib.request.urlopen(f"{url}.sha1") as response:
+            return response.read().decode("ascii").split()[0].strip().lower()
+    except Exception as e:
+        print(f"Warning: could not fetch checksum for {url}: {e}")
+        return None
+
+
+def jar_matches_checksum(jar_path, expected_sha1):
+    """Check a downloaded JAR against its published SHA-1 (any existing JAR passes if none is known)"""
+    if expected_sha1 is None:
+        return True
+    sha1 = hashlib.sha1()
+    with open(jar_path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest() == expected_sha1
+
+
 def setup_openapi_generator(build_from_source=False):
     """Setup OpenAPI Generator either from source or pre-built JAR"""
 
@@ -102,21 +213,38 @@ def setup_openapi_generator(build_from_source=False):
         jar_filename = f"openapi-generator-cli-{version}.jar"
         jar_path = cli_dir / jar_filename
 
-        if not jar_path.exists():
-            jar_url = f"https://repo1.maven.org/maven2/org/openapitools/openapi-generator-cli/{version}/{jar_filename}"
-            download_file(jar_url, str(jar_path))
-        else:
+        jar_url = f"https://repo1.maven.org/maven2/org/openapitools/openapi-generator-cli/{version}/{jar_filename}"
+        expected_sha1 = fetch_maven_sha1(jar_url)
+
+        if jar_path.exists() and jar_matches_checksum(jar_path, expected_sha1):
             print("OpenAPI Generator CLI JAR already exists, using existing file...")
+        else:
+            download_file(jar_url, str(jar_path))
+            if not jar_matches_checksum(jar_path, expected_sha1):
+                jar_path.unlink()
+                print(f"Error: checksum mismatch for downloaded {jar_filename}")
+                sys.exit(1)
 
         jar_path = str(jar_path)
 
     return jar_path
 
 
+def write_json_file(path, obj):
+    """Write obj to path as JSON indented by two spaces"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+            json.dump(obj, f, indent=2)
+
+
 def download_openapi_spec(api_token):
     """Download OpenAPI specification from Skydio API"""
     print("Downloading OpenAPI specification from Skydio API...")
 
+    import urllib.error
     import urllib.request
     import urllib.parse
     import json
@@ -128,13 +256,24 @@ def download_openapi_spec(api_token):
     url = "https://api.skydio.com/api/v0/openapi_spec"
     headers = {"Authorization": api_token, "accept": "application/json"}
 
+    # Revalidate a spec kept from a previous run instead of downloading it again
+    spec_file = sdk_dir / "openapi_spec.json"
+    etag_file = sdk_dir / "openapi_spec.json.etag"
+    if spec_file.exists() and etag_file.exists():
+        headers["If-None-Match"] = etag_file.read_text(encoding="utf-8").strip()
+
     try:
         req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req) as response:
-            response_data = response.read().decode("utf-8")
-
-        # Parse the JSON response
-        response_json = json.loads(response_data)
+        # Parse straight from the response stream instead of buffering the body as bytes and str
+        try:
+            with urllib.request.urlopen(req) as response:
+                etag = response.headers.get("ETag")
+                response_json = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            print("OpenAPI specification is unchanged, using existing file...")
+            return str(spec_file)
 
         # Check if this is a wrapped response with 'data' field
         if isinstance(response_json, dict) and "data" in response_json:
@@ -150,9 +289,11 @@ def download_openapi_spec(api_token):
             openapi_spec = response_json
 
         # Write the extracted OpenAPI spec to file inside skydio_sdk_generated
-        spec_file = sdk_dir / "openapi_spec.json"
-        with open(spec_file, "w", encoding="utf-8") as f:
-            json.dump(openapi_spec, f, indent=2)
+        write_json_file(spec_file, openapi_spec)
+        if etag:
+            etag_file.write_text(etag, encoding="utf-8")
+        elif etag_file.exists():
+            etag_file.unlink()
 
         print("Downloaded and extracted OpenAPI specification successfully")
         return str(spec_file)
@@ -225,13 +366,27 @@ def uninstall_python_sdk():
     print("Uninstall step completed")
 
 
-def clean_skydio_sdk_generated():
-    """Clean up the skydio_sdk_generated directory to start fresh"""
+def clean_skydio_sdk_generated(keep_downloads=True):
+    """
+    Clean up the skydio_sdk_generated directory to start fresh.
+
+    By default only the generated client is removed; the generator JAR and the OpenAPI spec
+    are kept so later runs can reuse them after checking they are still current.
+    """
     sdk_dir = Path("skydio_sdk_generated")
-    if sdk_dir.exists():
-        print("Cleaning up existing skydio_sdk_generated directory...")
-        shutil.rmtree(sdk_dir)
-        print("Cleaned up skydio_sdk_generated directory")
+    target_dir = sdk_dir / "python_api_client" if keep_downloads else sdk_dir
+    if target_dir.exists():
+        print(f"Cleaning up existing {target_dir} directory...")
+        shutil.rmtree(target_dir)
+        print(f"Cleaned up {target_dir} directory")
+
+
+# The generated ApiClient.__deserialize method, up to (not including) its first "if data is None:"
+DESERIALIZE_PATTERN = re.compile(
+    r'(?P<head>    def __deserialize\(self, data, klass\):\s*""".*?"""\n)'
+    r"(?P<indent>[ \t]*)if data is None:",
+    re.DOTALL,
+)
 
 
 def patch_sdk_for_data_unwrapping(output_dir):
@@ -267,58 +422,30 @@ def patch_sdk_for_data_unwrapping(output_dir):
         return response_data
 '''
 
-    # Insert the helper method before the deserialize method
-    if "def __deserialize(" in content:
-        # Add the helper method
-        content = content.replace(
-            "    def __deserialize(", patch_code + "\n    def __deserialize("
-        )
-
-        # Now modify the __deserialize method to use the helper
-        # Find where response_data is first used in deserialization
-        # Typically it's after response_data = self.__deserialize_primitive(data, klass)
-        # We need to wrap it after getting the data but before type checking
-
-        # Look for the pattern where we have the data and are about to deserialize it
-        old_pattern = '''    def __deserialize(self, data, klass):
-        """Deserializes dict, list, str into an object.
-
-        :param data: dict, list or str.
-        :param klass: class literal, or string of class name.
-
-        :return: object.
-        """
-        if data is None:
-            return None'''
-
-        new_pattern = '''    def __deserialize(self, data, klass):
-        """Deserializes dict, list, str into an object.
-
-        :param data: dict, list or str.
-        :param klass: class literal, or string of class name.
-
-        :return: object.
-        """
-        # Unwrap Skydio API response wrapper if present
-        data = self.__deserialize_data_wrapper(data, klass)
-        
-        if data is None:
-            return None'''
+    # Match the generated __deserialize signature and docstring regardless of their exact
+    # formatting, and insert the unwrap call right before the first "if data is None:" check
+    match = DESERIALIZE_PATTERN.search(content)
+    if not match:
+        print("⚠️  Warning: Could not find __deserialize method in api_client.py")
+        return
 
-        if old_pattern in content:
-            content = content.replace(old_pattern, new_pattern)
+    indent = match.group("indent")
+    content = (
+        content[: match.start()]
+        + patch_code
+        + "\n"
+        + match.group("head")
+        + f"{indent}# Unwrap Skydio API response wrapper if present\n"
+        + f"{indent}data = self.__deserialize_data_wrapper(data, klass)\n\n"
+        + indent
+        + content[match.end("indent") :]
+    )
 
-            # Write the patched content back
-            with open(api_client_path, "w", encoding="utf-8") as f:
-                f.write(content)
+    # Write the patched content back
+    with open(api_client_path, "w", encoding="utf-8") as f:
+        f.write(content)
 
-            print("✅ Successfully patched SDK to unwrap 'data' field")
-        else:
-            print(
-                "⚠️  Warning: Could not find expected deserialize method pattern to patch"
-            )
-    else:
-        print("⚠️  Warning: Could not find __deserialize method in api_client.py")
+    print("✅ Successfully patched SDK to unwrap 'data' field")
 
 
 def main():
@@ -330,6 +457,7 @@ Examples:
   export API_TOKEN="your_skydio_api_token"
   %(prog)s                    # Use pre-built JAR (faster)
   %(prog)s --build-from-source # Build from source
+  %(prog)s --clean             # Re-download the generator JAR and the spec too
         """,
     )
 
@@ -339,6 +467,12 @@ Examples:
         help="Build OpenAPI Generator from source (slower but latest version)",
     )
 
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Remove all of skydio_sdk_generated, including the cached JAR and spec",
+    )
+
     args = parser.parse_args()
 
     # Get API token from environment variable
@@ -351,8 +485,8 @@ Examples:
     # # Uninstall any existing SDK installation
     # uninstall_python_sdk()
 
-    # Clean up any existing skydio_sdk_generated directory
-    clean_skydio_sdk_generated()
+    # Clean up the previously generated client (or everything with --clean)
+    clean_skydio_sdk_generated(keep_downloads=not args.clean)
 
     # Set up Java environment
     find_java_home()
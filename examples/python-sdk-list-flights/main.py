@@ -1,38 +1,58 @@
 import csv
 import os
-from datetime import datetime
-import pytz
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from timezonefinder import TimezoneFinder
+from urllib3.util.retry import Retry
 import skydio_sdk
 
+# Building a TimezoneFinder loads its polygon tables, so create one and reuse it for every row
+_TF = TimezoneFinder()
+
 
 def main():
     csv_file = "flights.csv"
-    per_page = 10
+    per_page = 100  # Fewer, larger pages amortize per-request overhead
 
     configuration = skydio_sdk.Configuration(
         host="https://api.skydio.com/api",
         api_key={"APITokenHeader": os.environ.get("API_TOKEN")},
     )
+    # The generated client keeps one urllib3 pool for its lifetime, so every page request reuses
+    # the same keep-alive connections; retry transient failures instead of aborting the export
+    configuration.connection_pool_maxsize = 8
+    configuration.retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
 
     with skydio_sdk.ApiClient(configuration) as api_client:
         api_instance = skydio_sdk.FlightsApi(api_client)
         total_flights_exported = 0
-        with open(csv_file, "w", newline="", encoding="utf-8") as csvfile:
+        with open(
+            csv_file, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE
+        ) as csvfile:
             writer = csv.DictWriter(
                 csvfile, fieldnames=CSV_FIELDNAMES, extrasaction="ignore"
             )
             writer.writeheader()
-            for flight_data in iterate_flight_pages(api_instance, per_page):
-                flight = skydio_sdk.Flight.from_dict(flight_data)
-                row = build_flight_csv_row(flight)
-                writer.writerow(row)
-                total_flights_exported += 1
+            for flights in iterate_flight_pages(api_instance, per_page):
+                writer.writerows(build_flight_csv_row(flight) for flight in flights)
+                total_flights_exported += len(flights)
 
         print(f"\nSuccessfully exported {total_flights_exported} flights to {csv_file}")
         return 0
 
 
+# Number of flight pages fetched concurrently once the total page count is known
+PAGE_FETCH_WORKERS = 4
+
+# Write the CSV through a 1 MiB buffer rather than the default few KiB
+CSV_BUFFER_SIZE = 1024 * 1024
+
 CSV_FIELDNAMES = [
     "flight_id",
     "user_email",
@@ -63,121 +83,155 @@ CSV_FIELDNAMES = [
 ]
 
 
-def build_flight_csv_row(flight: skydio_sdk.Flight):
+# (CSV column, attachment index, attachment field) for the attachment_N_* columns, built once
+ATTACHMENT_COLUMNS = [
+    (f"attachment_{index + 1}_{suffix}", index, field)
+    for index in range(4)
+    for suffix, field in (
+        ("serial", "attachment_serial"),
+        ("type", "attachment_type"),
+        ("mount_point", "mount_point"),
+    )
+]
+
 
-    return {
-        "flight_id": flight.flight_id,
-        "user_email": flight.user_email,
-        "has_telemetry": flight.has_telemetry,
-        "takeoff_time": flight.takeoff,
-        "takeoff_latitude": flight.takeoff_latitude,
-        "takeoff_longitude": flight.takeoff_longitude,
-        "takeoff_time_local": utc_to_local(
-            flight.takeoff_latitude, flight.takeoff_longitude, flight.takeoff
-        ),
-        "landing_time": flight.landing,
-        "landing_time_local": utc_to_local(
-            flight.takeoff_latitude, flight.takeoff_longitude, flight.landing
-        ),
+def build_flight_csv_row(flight: dict):
+    """Build a CSV row from a raw flight dict, without constructing an SDK model."""
+    # Bind the per-row lookups to locals; this runs once per exported flight
+    get = flight.get
+    takeoff = get("takeoff")
+    landing = get("landing")
+    # Parse each timestamp once and share it between the local-time and duration columns
+    takeoff_dt = parse_timestamp(takeoff)
+    landing_dt = parse_timestamp(landing)
+    latitude = get("takeoff_latitude")
+    longitude = get("takeoff_longitude")
+    # Both local times use the takeoff location, so resolve its timezone once per row
+    local_tz = local_timezone_at(latitude, longitude)
+    # Look up the nested containers once rather than re-walking them for every column
+    sensor_package = get("sensor_package")
+    attachments = get("attachments")
+
+    row = {
+        "flight_id": get("flight_id"),
+        "user_email": get("user_email"),
+        "has_telemetry": get("has_telemetry"),
+        "takeoff_time": takeoff,
+        "takeoff_latitude": latitude,
+        "takeoff_longitude": longitude,
+        "takeoff_time_local": utc_to_local(takeoff_dt, local_tz),
+        "landing_time": landing,
+        "landing_time_local": utc_to_local(landing_dt, local_tz),
         "duration": (
-            (
-                datetime.fromisoformat(flight.landing)
-                - datetime.fromisoformat(flight.takeoff)
-            ).total_seconds()
-            if flight.takeoff and flight.landing
+            (landing_dt - takeoff_dt).total_seconds()
+            if takeoff_dt and landing_dt
             else ""
         ),
-        "vehicle_serial": flight.vehicle_serial,
-        "battery_serial": flight.battery_serial,
-        "sensor_package_serial": get_deep(
-            flight,
-            "sensor_package",
-            "sensor_package_serial",
-        ),
-        "sensor_package_type": get_deep(
-            flight,
-            "sensor_package",
-            "sensor_package_type",
-        ),
-        "attachment_1_serial": get_deep(flight, "attachments", 0, "attachment_serial"),
-        "attachment_1_type": get_deep(flight, "attachments", 0, "attachment_type"),
-        "attachment_1_mount_point": get_deep(flight, "attachments", 0, "mount_point"),
-        "attachment_2_serial": get_deep(flight, "attachments", 1, "attachment_serial"),
-        "attachment_2_type": get_deep(flight, "attachments", 1, "attachment_type"),
-        "attachment_2_mount_point": get_deep(flight, "attachments", 1, "mount_point"),
-        "attachment_3_serial": get_deep(flight, "attachments", 2, "attachment_serial"),
-        "attachment_3_type": get_deep(flight, "attachments", 2, "attachment_type"),
-        "attachment_3_mount_point": get_deep(flight, "attachments", 2, "mount_point"),
-        "attachment_4_serial": get_deep(flight, "attachments", 3, "attachment_serial"),
-        "attachment_4_type": get_deep(flight, "attachments", 3, "attachment_type"),
-        "attachment_4_mount_point": get_deep(flight, "attachments", 3, "mount_point"),
+        "vehicle_serial": get("vehicle_serial"),
+        "battery_serial": get("battery_serial"),
+        "sensor_package_serial": get_deep(sensor_package, "sensor_package_serial"),
+        "sensor_package_type": get_deep(sensor_package, "sensor_package_type"),
     }
+    deep = get_deep
+    for column, index, field in ATTACHMENT_COLUMNS:
+        row[column] = deep(attachments, index, field)
+    return row
 
 
 def iterate_flight_pages(api_instance: skydio_sdk.FlightsApi, per_page: int):
+    """Yield the list of flights on each page, in page order."""
 
     page_number = 1
     total_pages = None
 
-    while True:
-        print(f"Fetching page {page_number}...")
+    flights_get = api_instance.flights_get_v0_flights
+
+    def fetch_page(page_number):
+        # Log the first page and every 10th after that so large exports don't flood stdout
+        if page_number == 1 or page_number % 10 == 0:
+            print(f"Fetching page {page_number}...")
+        return flights_get(page_number=page_number, per_page=per_page)
 
-        api_response = api_instance.flights_get_v0_flights(
-            page_number=page_number, per_page=per_page
-        )
+    # Fetch upcoming pages in the background while the caller processes the current one. Once
+    # page 1 reports the page count, keep up to PAGE_FETCH_WORKERS pages in flight; otherwise
+    # only prefetch one page ahead since we can't tell where the listing ends
+    with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+        pending = deque([executor.submit(fetch_page, page_number)])
+        next_page_number = page_number + 1
 
-        flights = api_response.flights if hasattr(api_response, "flights") else []
+        while pending:
+            api_response = pending.popleft().result()
 
-        if hasattr(api_response, "pagination"):
-            pagination = api_response.pagination
-            if hasattr(pagination, "total_pages"):
-                total_pages = pagination.total_pages
-                if page_number == 1:
-                    print(f"Total pages: {total_pages}")
+            flights = api_response.flights if hasattr(api_response, "flights") else []
 
-        if not flights:
-            break
+            if hasattr(api_response, "pagination"):
+                pagination = api_response.pagination
+                if hasattr(pagination, "total_pages"):
+                    total_pages = pagination.total_pages
+                    if page_number == 1:
+                        print(f"Total pages: {total_pages}")
 
-        for flight in flights:
-            yield flight
+            if not flights:
+                break
 
-        if total_pages is not None and page_number >= total_pages:
-            break
-        if total_pages is None and len(flights) < per_page:
-            break
+            is_last_page = (total_pages is not None and page_number >= total_pages) or (
+                total_pages is None and len(flights) < per_page
+            )
+            if not is_last_page:
+                max_pending = PAGE_FETCH_WORKERS if total_pages is not None else 1
+                while len(pending) < max_pending and (
+                    total_pages is None or next_page_number <= total_pages
+                ):
+                    pending.append(executor.submit(fetch_page, next_page_number))
+                    next_page_number += 1
 
-        page_number += 1
+            yield flights
 
+            if is_last_page:
+                break
 
-def utc_to_local(lat, lon, utc_value):
-    if utc_value is None or lat is None or lon is None:
-        return ""
+            page_number += 1
+
+        # Don't wait on pages that will never be read (e.g. after an unexpectedly empty page)
+        for future in pending:
+            future.cancel()
 
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp from the API, returning None if it is missing or invalid."""
+    if not value:
+        return None
     try:
-        if isinstance(utc_value, str):
-            utc_dt = datetime.fromisoformat(utc_value)
-        else:
-            utc_dt = utc_value
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
 
-        if utc_dt.tzinfo is None:
-            utc_dt = pytz.utc.localize(utc_dt)
-        else:
-            utc_dt = utc_dt.astimezone(pytz.utc)
 
-        lat_f = float(lat)
-        lon_f = float(lon)
+def local_timezone_at(lat, lon):
+    """Return the timezone at a coordinate, or None if it can't be determined."""
+    if lat is None or lon is None:
+        return None
+
+    try:
+        # ZoneInfo keeps its own cache of zones, so repeat names don't reload the zone file
+        tz_name = _TF.timezone_at(lat=float(lat), lng=float(lon))
+        return ZoneInfo(tz_name) if tz_name else None
+    except (ValueError, ZoneInfoNotFoundError, TypeError):
+        return None
 
-        tf = TimezoneFinder()
-        tz_name = tf.timezone_at(lat=lat_f, lng=lon_f)
-        if not tz_name:
-            return ""
 
-        local_tz = pytz.timezone(tz_name)
-        local_dt = utc_dt.astimezone(local_tz)
-        return local_dt.isoformat()
-    except (ValueError, pytz.UnknownTimeZoneError, TypeError):
+def utc_to_local(utc_dt, local_tz):
+    if utc_dt is None or local_tz is None:
         return ""
 
+    if utc_dt.tzinfo is None:
+        utc_dt = utc_dt.replace(tzinfo=timezone.utc)
+    return utc_dt.astimezone(local_tz).isoformat()
+
+
+# Sentinel for get_deep, distinct from any value (including "") a field can hold
+_MISSING = object()
+
 
 def get_deep(root, *path, default: str = "") -> str:
     """Safely navigate nested attributes / dicts / lists, defaulting to an empty string."""
@@ -193,11 +247,14 @@ def get_deep(root, *path, default: str = "") -> str:
             cur = cur[key]
             continue
 
-        # key is a string: support both dicts and objects
+        # key is a string: support both dicts and objects. A missing key stops the walk
+        # immediately instead of carrying the default into the next lookup.
         if isinstance(cur, dict):
-            cur = cur.get(key, default)
+            cur = cur.get(key, _MISSING)
         else:
-            cur = getattr(cur, key, default)
+            cur = getattr(cur, key, _MISSING)
+        if cur is _MISSING:
+            return default
 
     return default if cur is None else cur
 
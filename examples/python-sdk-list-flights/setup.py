@@ -4,9 +4,10 @@ setup(
     name="python_sdk_list_flights",
     version="0.1.0",
     packages=find_packages(),
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=[
-        "pytz",
         "timezonefinder",
+        # zoneinfo needs the IANA database, which Windows doesn't ship
+        "tzdata; platform_system == 'Windows'",
     ],
 )
@@ -0,0 +1,89 @@
+"""Optional Numba-compiled kernels for geo.py.
+
+Numba is NOT a dependency of this example. When it is installed, the kernels below
+are compiled with @njit(cache=True) on first call (~1s, then cached on disk) and run
+at native speed afterwards. Without Numba they are plain Python functions that give
+the same results, so callers never need to check which one they got.
+
+The kernels take plain floats (no GpsPoint) so Numba can compile them in nopython mode.
+"""
+
+import math
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def _jit(func):
+    """Compile func with Numba if available, otherwise return it unchanged."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+@_jit
+def gps_to_enu(lat, lon, alt, lat0, lon0, alt0, a, e_sq):
+    """Convert a GPS point to ENU meters relative to (lat0, lon0, alt0).
+
+    Same math as geo.LocalFrame(origin).gps_to_enu(point). `a` and `e_sq` are the
+    WGS84 equatorial radius and first eccentricity squared.
+
+    Returns:
+        (east, north, up) tuple in meters
+    """
+    lat_rad = math.radians(lat0)
+    sin_lat = math.sin(lat_rad)
+    w = 1.0 - e_sq * sin_lat * sin_lat
+    sqrt_w = math.sqrt(w)
+    n = a / sqrt_w
+    m = a * (1.0 - e_sq) / (w * sqrt_w)
+    rad_per_deg = math.pi / 180.0
+    east = (lon - lon0) * (rad_per_deg * n * math.cos(lat_rad))
+    north = (lat - lat0) * (rad_per_deg * m)
+    return east, north, alt - alt0
+
+
+@_jit
+def heading_pitch(lat1, lon1, alt1, lat2, lon2, alt2, a, e_sq):
+    """Compute ENU heading and gimbal pitch from point 1 looking at point 2.
+
+    Same results as geo.heading_between() and geo.pitch_to_target(), in one pass.
+
+    Returns:
+        (heading_deg, pitch_deg) tuple
+    """
+    east, north, up = gps_to_enu(lat2, lon2, alt2, lat1, lon1, alt1, a, e_sq)
+    heading_deg = math.degrees(math.atan2(north, east)) % 360.0
+
+    horizontal_dist = math.hypot(east, north)
+    if horizontal_dist < 0.001:  # Very close horizontally
+        pitch_deg = 90.0 if up < 0 else -90.0
+    else:
+        pitch_deg = -math.degrees(math.atan2(up, horizontal_dist))
+    return heading_deg, pitch_deg
+
+
+@_jit
+def look_at_solve_batch(from_lats, from_lons, from_alts, to_lats, to_lons, to_alts, a, e_sq,
+                        out_heading, out_pitch, out_distance):
+    """Fill heading, pitch and distance for each from/to pair in one loop.
+
+    Same math as geo.look_at_solve(), applied to whole arrays. Results are written into
+    the three preallocated output arrays.
+    """
+    for i in range(len(from_lats)):
+        east, north, up = gps_to_enu(
+            to_lats[i], to_lons[i], to_alts[i], from_lats[i], from_lons[i], from_alts[i], a, e_sq
+        )
+        out_heading[i] = math.degrees(math.atan2(north, east)) % 360.0
+
+        horizontal_dist = math.hypot(east, north)
+        if horizontal_dist < 0.001:  # Very close horizontally
+            out_pitch[i] = 90.0 if up < 0 else -90.0
+        else:
+            out_pitch[i] = -math.degrees(math.atan2(up, horizontal_dist))
+        out_distance[i] = math.hypot(horizontal_dist, up)
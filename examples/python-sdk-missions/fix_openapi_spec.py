@@ -10,40 +10,139 @@ Usage:
     fixed_spec = fix_openapi_spec(openapi_spec)
 """
 
-import copy
+import json
+from collections import deque
+
+
+def _clone_json(obj):
+    """
+    Deep-copy a JSON-compatible value.
+
+    The spec is plain JSON data (no cycles or custom objects), so a serialize/parse round trip
+    is much cheaper than copy.deepcopy and its memo bookkeeping.
+    """
+    return json.loads(json.dumps(obj))
+
+
+# JSON Schema meta-properties that confuse code generators
+META_PROPERTIES = frozenset({"$id", "$schema"})
+
+
+def _walk(obj, node_fixes=(), clean_refs=False, drop_keys=frozenset()):
+    """
+    Fix a spec subtree in place in a single traversal, returning the (possibly replaced) root.
+
+    Children are fixed first, then each fix in node_fixes is applied to the dict. Dicts that
+    no node fix can change (see _has_fix_trigger) are not revisited, which is most of the spec.
+    If clean_refs is set, $ref objects are reduced to just their $ref without descending
+    into them, and keys in drop_keys are removed from every dict. Containers are only
+    replaced when a $ref object has to be trimmed; everything else is updated in place.
+
+    The walk uses an explicit stack, so deeply nested schemas can't hit the recursion limit.
+    """
+    if clean_refs and isinstance(obj, dict) and "$ref" in obj:
+        return obj if len(obj) == 1 else {"$ref": obj["$ref"]}
+
+    # Entries are (container, children_done); a dict is pushed a second time with
+    # children_done=True so its node fixes run after everything beneath it
+    stack = [(obj, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            for fix in node_fixes:
+                fix(node)
+            continue
+
+        if isinstance(node, dict):
+            for key in drop_keys.intersection(node):
+                del node[key]
+            if node_fixes and _has_fix_trigger(node):
+                stack.append((node, True))
+            children = node.items()
+        elif isinstance(node, list):
+            children = enumerate(node)
+        else:
+            continue
+
+        for key, value in children:
+            if isinstance(value, dict):
+                if clean_refs and "$ref" in value:
+                    if len(value) > 1:
+                        node[key] = {"$ref": value["$ref"]}
+                    continue
+                stack.append((value, False))
+            elif isinstance(value, list):
+                stack.append((value, False))
+    return obj
+
+
+def _has_fix_trigger(obj):
+    # Every *_node fix below only acts on dicts with one of these; the rest can be skipped
+    return "enum" in obj or "const" in obj or obj.get("type") == "file"
+
+
+def _fix_file_type_node(obj):
+    if obj.get("type") == "file":
+        del obj["type"]
+        obj["type"] = "string"
+        obj["format"] = "binary"
+
+
+def _fix_invalid_const_node(obj):
+    if "const" in obj:
+        const_val = obj["const"]
+        if isinstance(const_val, list):
+            # Convert const (list) to enum
+            del obj["const"]
+            obj["enum"] = const_val
+        elif isinstance(const_val, bool):
+            # Remove boolean const - not supported by openapi-python-client
+            del obj["const"]
+
+
+def _deduplicate_enum_node(obj):
+    if "enum" in obj and isinstance(obj["enum"], list):
+        # Deduplicate while preserving order
+        seen = set()
+        unique_enum = []
+        for val in obj["enum"]:
+            if val not in seen:
+                seen.add(val)
+                unique_enum.append(val)
+        obj["enum"] = unique_enum
+
+
+def _fix_array_with_enum_node(obj):
+    # Check if this is an array with enum at the wrong level
+    if (
+        obj.get("type") == "array"
+        and "enum" in obj
+        and "items" in obj
+        and isinstance(obj["enum"], list)
+    ):
+        # Move enum to items
+        enum = obj.pop("enum")
+        items = obj["items"]
+        if isinstance(items, dict):
+            items = dict(items)  # Copy
+            items["enum"] = enum
+            obj["items"] = items
+            # items was already fixed, so re-check it now that it has an enum (nested arrays)
+            _fix_array_with_enum_node(items)
 
 
 def clean_ref_objects(obj):
     """
     Recursively clean up OpenAPI spec by removing extra properties from $ref objects.
     """
-    if isinstance(obj, dict):
-        if "$ref" in obj:
-            return {"$ref": obj["$ref"]}
-        else:
-            return {key: clean_ref_objects(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_ref_objects(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, clean_refs=True)
 
 
 def strip_json_schema_meta_properties(obj):
     """
     Recursively strip JSON Schema meta-properties that confuse code generators.
     """
-    meta_properties = {"$id", "$schema"}
-
-    if isinstance(obj, dict):
-        return {
-            key: strip_json_schema_meta_properties(value)
-            for key, value in obj.items()
-            if key not in meta_properties
-        }
-    elif isinstance(obj, list):
-        return [strip_json_schema_meta_properties(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, drop_keys=META_PROPERTIES)
 
 
 def fix_file_type(obj):
@@ -51,18 +150,7 @@ def fix_file_type(obj):
     Recursively fix non-standard "type": "file" by converting to "type": "string"
     with "format": "binary".
     """
-    if isinstance(obj, dict):
-        if obj.get("type") == "file":
-            new_obj = {k: v for k, v in obj.items() if k != "type"}
-            new_obj["type"] = "string"
-            new_obj["format"] = "binary"
-            return {key: fix_file_type(value) for key, value in new_obj.items()}
-        else:
-            return {key: fix_file_type(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [fix_file_type(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, (_fix_file_type_node,))
 
 
 def fix_invalid_const(obj):
@@ -73,26 +161,7 @@ def fix_invalid_const(obj):
     - If const is a boolean, remove it (openapi-python-client doesn't support boolean const)
       The 'default' and 'type' fields already capture the intended value.
     """
-    if isinstance(obj, dict):
-        if "const" in obj:
-            const_val = obj["const"]
-            if isinstance(const_val, list):
-                # Convert const (list) to enum
-                new_obj = {k: v for k, v in obj.items() if k != "const"}
-                new_obj["enum"] = const_val
-                return {key: fix_invalid_const(value) for key, value in new_obj.items()}
-            elif isinstance(const_val, bool):
-                # Remove boolean const - not supported by openapi-python-client
-                new_obj = {k: v for k, v in obj.items() if k != "const"}
-                return {key: fix_invalid_const(value) for key, value in new_obj.items()}
-            else:
-                return {key: fix_invalid_const(value) for key, value in obj.items()}
-        else:
-            return {key: fix_invalid_const(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [fix_invalid_const(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, (_fix_invalid_const_node,))
 
 
 def deduplicate_enums(obj):
@@ -102,24 +171,7 @@ def deduplicate_enums(obj):
     Some enums in the spec have duplicate values which causes code generators to fail.
     This removes duplicates while preserving order.
     """
-    if isinstance(obj, dict):
-        if "enum" in obj and isinstance(obj["enum"], list):
-            # Deduplicate while preserving order
-            seen = set()
-            unique_enum = []
-            for val in obj["enum"]:
-                if val not in seen:
-                    seen.add(val)
-                    unique_enum.append(val)
-            new_obj = dict(obj)
-            new_obj["enum"] = unique_enum
-            return {key: deduplicate_enums(value) for key, value in new_obj.items()}
-        else:
-            return {key: deduplicate_enums(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [deduplicate_enums(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, (_deduplicate_enum_node,))
 
 
 def fix_array_with_enum(obj):
@@ -132,28 +184,28 @@ def fix_array_with_enum(obj):
     to:
     {type: array, items: {type: string, enum: [...]}}
     """
-    if isinstance(obj, dict):
-        # Check if this is an array with enum at the wrong level
-        if (
-            obj.get("type") == "array"
-            and "enum" in obj
-            and "items" in obj
-            and isinstance(obj["enum"], list)
-        ):
-            # Move enum to items
-            new_obj = {k: v for k, v in obj.items() if k != "enum"}
-            items = new_obj.get("items", {})
-            if isinstance(items, dict):
-                items = dict(items)  # Copy
-                items["enum"] = obj["enum"]
-                new_obj["items"] = items
-            return {key: fix_array_with_enum(value) for key, value in new_obj.items()}
-        else:
-            return {key: fix_array_with_enum(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [fix_array_with_enum(item) for item in obj]
-    else:
-        return obj
+    return _walk(obj, (_fix_array_with_enum_node,))
+
+
+def clean_up_spec(obj):
+    """
+    Apply all of the cleanups above in a single traversal.
+
+    Equivalent to running clean_ref_objects, strip_json_schema_meta_properties, fix_file_type,
+    fix_invalid_const, deduplicate_enums and fix_array_with_enum one after another, but walks
+    the spec once instead of six times. Like them, it updates the spec in place.
+    """
+    return _walk(
+        obj,
+        (
+            _fix_file_type_node,
+            _fix_invalid_const_node,
+            _deduplicate_enum_node,
+            _fix_array_with_enum_node,
+        ),
+        clean_refs=True,
+        drop_keys=META_PROPERTIES,
+    )
 
 
 def rename_dotted_schema_names(openapi_spec):
@@ -171,7 +223,8 @@ def rename_dotted_schema_names(openapi_spec):
 
     # Build a mapping of old names to new names
     rename_map = {}
-    new_names_set = set()
+    # Existing schema names plus the new names handed out so far
+    taken = set(schemas)
 
     # First pass: determine all new names to avoid collisions
     for old_name in list(schemas.keys()):
@@ -181,12 +234,12 @@ def rename_dotted_schema_names(openapi_spec):
 
             # Handle collisions
             suffix = 2
-            while new_name in schemas or new_name in new_names_set:
+            while new_name in taken:
                 new_name = f"{base_new_name}{suffix}"
                 suffix += 1
 
             rename_map[old_name] = new_name
-            new_names_set.add(new_name)
+            taken.add(new_name)
             print(f"  Renaming schema: {old_name} -> {new_name}")
 
     if not rename_map:
@@ -199,25 +252,32 @@ def rename_dotted_schema_names(openapi_spec):
         new_schemas[new_name] = schema
     openapi_spec["components"]["schemas"] = new_schemas
 
-    # Update all $ref references throughout the spec
+    # Update all $ref references throughout the spec, looking each one up by its full ref string
+    ref_map = {
+        f"#/components/schemas/{old_name}": f"#/components/schemas/{new_name}"
+        for old_name, new_name in rename_map.items()
+    }
+
     def update_refs(obj):
-        if isinstance(obj, dict):
-            if "$ref" in obj:
-                ref = obj["$ref"]
-                # Check if this ref points to a renamed schema
-                for old_name, new_name in rename_map.items():
-                    old_ref = f"#/components/schemas/{old_name}"
-                    new_ref = f"#/components/schemas/{new_name}"
-                    if ref == old_ref:
-                        obj = {"$ref": new_ref}
-                        break
-                return obj
-            else:
-                return {key: update_refs(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [update_refs(item) for item in obj]
-        else:
-            return obj
+        if isinstance(obj, dict) and "$ref" in obj:
+            new_ref = ref_map.get(obj["$ref"])
+            return obj if new_ref is None else {"$ref": new_ref}
+
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items() if isinstance(node, dict) else enumerate(node):
+                if isinstance(value, dict):
+                    if "$ref" in value:
+                        # Check if this ref points to a renamed schema
+                        new_ref = ref_map.get(value["$ref"])
+                        if new_ref is not None:
+                            node[key] = {"$ref": new_ref}
+                        continue
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.append(value)
+        return obj
 
     return update_refs(openapi_spec)
 
@@ -234,64 +294,46 @@ def strip_inline_schema_titles(openapi_spec):
     """
 
     def strip_titles(obj):
-        """Recursively strip title from inline object schemas"""
-        if isinstance(obj, dict):
-            # If this has a title and looks like an object schema, remove the title
-            if (
-                "title" in obj
-                and "$ref" not in obj
-                and (
-                    obj.get("type") == "object"
-                    or "properties" in obj
-                    or "oneOf" in obj
-                    or "anyOf" in obj
-                    or "allOf" in obj
-                )
-            ):
-                # Remove title and continue processing nested content
-                return {
-                    key: strip_titles(value)
-                    for key, value in obj.items()
-                    if key != "title"
-                }
-            else:
-                return {key: strip_titles(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [strip_titles(item) for item in obj]
-        else:
-            return obj
+        """Strip title from inline object schemas in the subtree, in place"""
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                # If this has a title and looks like an object schema, remove the title
+                if (
+                    "title" in node
+                    and "$ref" not in node
+                    and (
+                        node.get("type") == "object"
+                        or "properties" in node
+                        or "oneOf" in node
+                        or "anyOf" in node
+                        or "allOf" in node
+                    )
+                ):
+                    del node["title"]
+                # Continue processing nested content
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
 
     # Process the entire spec
-    result = {}
     for key, value in openapi_spec.items():
         if key == "components":
-            result["components"] = {}
             for comp_key, comp_value in value.items():
                 if comp_key == "schemas":
                     # For top-level schemas, keep their title but strip from nested content
-                    processed_schemas = {}
-                    for schema_name, schema_def in comp_value.items():
+                    for schema_def in comp_value.values():
                         if isinstance(schema_def, dict):
-                            processed_schema = {}
                             for prop_key, prop_value in schema_def.items():
-                                if prop_key == "title":
-                                    # Keep top-level schema title
-                                    processed_schema[prop_key] = prop_value
-                                else:
-                                    # Strip titles from nested content
-                                    processed_schema[prop_key] = strip_titles(
-                                        prop_value
-                                    )
-                            processed_schemas[schema_name] = processed_schema
-                        else:
-                            processed_schemas[schema_name] = schema_def
-                    result["components"]["schemas"] = processed_schemas
+                                if prop_key != "title":
+                                    strip_titles(prop_value)
                 else:
-                    result["components"][comp_key] = strip_titles(comp_value)
+                    strip_titles(comp_value)
         else:
-            result[key] = strip_titles(value)
+            strip_titles(value)
 
-    return result
+    return openapi_spec
 
 
 def fix_action_args_schema(openapi_spec):
@@ -327,22 +369,22 @@ def fix_action_args_schema(openapi_spec):
     sep = "." if use_dots else "_"
 
     # Find the full oneOf by traversing into the nested structure
-    def find_full_oneof(obj, depth=0):
-        """Recursively find a oneOf array that has more than just sequence"""
-        if isinstance(obj, dict):
-            if "oneOf" in obj and isinstance(obj["oneOf"], list):
-                oneof = obj["oneOf"]
-                if len(oneof) > 1:
+    def find_full_oneof(obj):
+        """Breadth-first search for the shallowest oneOf array that has more than just sequence"""
+        queue = deque([obj])
+        while queue:
+            node = queue.popleft()
+            if isinstance(node, dict):
+                oneof = node.get("oneOf")
+                if isinstance(oneof, list) and len(oneof) > 1:
                     return oneof
-            for value in obj.values():
-                result = find_full_oneof(value, depth + 1)
-                if result:
-                    return result
-        elif isinstance(obj, list):
-            for item in obj:
-                result = find_full_oneof(item, depth + 1)
-                if result:
-                    return result
+                children = node.values()
+            elif isinstance(node, list):
+                children = node
+            else:
+                continue
+            # Only containers can hold a oneOf; skip strings, numbers, etc.
+            queue.extend(child for child in children if isinstance(child, (dict, list)))
         return None
 
     full_oneof = find_full_oneof(action_args_schema)
@@ -386,7 +428,7 @@ def fix_action_args_schema(openapi_spec):
                 isinstance(action_prop_value, dict)
                 and "properties" in action_prop_value
             ):
-                seq_schema = copy.deepcopy(action_prop_value)
+                seq_schema = _clone_json(action_prop_value)
                 # Replace the nested actions.items with $ref to Action
                 if "actions" in seq_schema.get("properties", {}):
                     seq_schema["properties"]["actions"]["items"] = {
@@ -465,16 +507,12 @@ def fix_openapi_spec(openapi_spec):
         openapi_spec: The raw OpenAPI specification dict
 
     Returns:
-        The fixed OpenAPI specification dict
+        The fixed OpenAPI specification dict. The input is modified in place, so pass a copy
+        if the original is still needed.
     """
     # Clean up the spec
     print("Cleaning up OpenAPI spec...")
-    openapi_spec = clean_ref_objects(openapi_spec)
-    openapi_spec = strip_json_schema_meta_properties(openapi_spec)
-    openapi_spec = fix_file_type(openapi_spec)
-    openapi_spec = fix_invalid_const(openapi_spec)
-    openapi_spec = deduplicate_enums(openapi_spec)
-    openapi_spec = fix_array_with_enum(openapi_spec)
+    openapi_spec = clean_up_spec(openapi_spec)
 
     # Apply additional fixes for better code generation
     print("Applying schema fixes...")
@@ -12,6 +12,7 @@ Usage:
 import argparse
 import json
 import os
+import shlex
 import ssl
 import subprocess
 import sys
@@ -21,12 +22,40 @@ from pathlib import Path
 
 from fix_openapi_spec import fix_openapi_spec
 
+# orjson parses and serializes the multi-megabyte spec several times faster than the stdlib
+# json module; it is optional and json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json_bytes(data):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json_file(path, obj):
+    """Write obj to path as JSON indented by two spaces"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump already encodes incrementally (iterencode) and writes each chunk as it goes,
+        # so the full document string is never built in memory
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+
 
 def run_command(cmd, cwd=None, check=True):
-    """Run a shell command"""
-    print(f"Running: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
+    """Run a command given as an argument list (executed directly, without a shell)"""
+    if not isinstance(cmd, list):
+        raise TypeError("run_command expects a list of arguments")
+    print(f"Running: {shlex.join(cmd)}")
     try:
-        result = subprocess.run(cmd, cwd=cwd, check=check, shell=isinstance(cmd, str))
+        result = subprocess.run(cmd, cwd=cwd, check=check)
         return result
     except subprocess.CalledProcessError as e:
         print(f"Command failed with exit code {e.returncode}")
@@ -58,9 +87,15 @@ def download_openapi_spec(api_token, output_dir):
             raise
 
         with urllib.request.urlopen(req, context=ctx) as response:
-            response_data = response.read().decode("utf-8")
+            response_data = response.read()
 
-        response_json = json.loads(response_data)
+        # Parse the raw bytes; both parsers handle UTF-8 directly, so there's no decode copy.
+        # The bytes are released right after parsing, and fix_openapi_spec edits the parsed spec
+        # in place, so only one full copy of the spec is alive from here on. (Streaming the
+        # parse wouldn't help further: the fixes rename schemas and rewrite $refs across the
+        # whole document, so they need all of it in memory.)
+        response_json = load_json_bytes(response_data)
+        del response_data
 
         if isinstance(response_json, dict) and "data" in response_json:
             print("Detected wrapped API response, extracting OpenAPI spec...")
@@ -75,8 +110,7 @@ def download_openapi_spec(api_token, output_dir):
 
         # Save the original spec for comparison/debugging
         original_spec_file = sdk_dir / "openapi_spec_original.json"
-        with open(original_spec_file, "w", encoding="utf-8") as f:
-            json.dump(openapi_spec, f, indent=2)
+        write_json_file(original_spec_file, openapi_spec)
         print(f"Saved original OpenAPI spec to {original_spec_file}")
 
         # Apply all fixes to the spec
@@ -84,8 +118,7 @@ def download_openapi_spec(api_token, output_dir):
 
         # Write the modified spec to file
         spec_file = sdk_dir / "openapi_spec.json"
-        with open(spec_file, "w", encoding="utf-8") as f:
-            json.dump(openapi_spec, f, indent=2)
+        write_json_file(spec_file, openapi_spec)
         print(f"Saved modified OpenAPI spec to {spec_file}")
 
         print("Downloaded and cleaned OpenAPI specification successfully")
@@ -103,11 +136,14 @@ def install_openapi_python_client():
     """Install openapi-python-client if not already installed"""
     print("Checking for openapi-python-client...")
 
-    import importlib.util
+    # A metadata lookup: confirms the distribution (and its CLI) is installed without
+    # locating or importing the package itself
+    from importlib.metadata import PackageNotFoundError, distribution
 
-    if importlib.util.find_spec("openapi_python_client") is not None:
+    try:
+        distribution("openapi-python-client")
         print("openapi-python-client is already installed")
-    else:
+    except PackageNotFoundError:
         print("Installing openapi-python-client and certifi...")
         run_command([sys.executable, "-m", "pip", "install", "openapi-python-client", "certifi"])
         print("openapi-python-client installed successfully")
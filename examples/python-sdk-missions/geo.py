@@ -48,9 +48,13 @@ compared to spherical approximations.
 """
 
 from __future__ import annotations
+import functools
 import math
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Sequence
+
+import _geo_numba
 
 
 # =============================================================================
@@ -64,6 +68,13 @@ EARTH_POLAR_RADIUS_M = 6_356_752.3       # Semi-minor axis (b)
 # Derived: First eccentricity squared
 _E_SQ = 1 - (EARTH_POLAR_RADIUS_M / EARTH_EQUATORIAL_RADIUS_M) ** 2
 
+# Radians in one degree (same value as math.radians(1))
+_RAD_PER_DEG = math.pi / 180.0
+
+# Points are created per waypoint and per conversion, so drop the per-instance __dict__
+# where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 # Mission limits
 DEFAULT_SPEED_MPS = 5.0
 DEFAULT_GIMBAL_PITCH_DEG = 0.0  # Level with horizon
@@ -73,7 +84,7 @@ DEFAULT_GIMBAL_PITCH_DEG = 0.0  # Level with horizon
 # Dataclasses
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class GpsPoint:
     """A point in GPS coordinates with mission altitude.
     
@@ -95,7 +106,7 @@ class GpsPoint:
     alt: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class EnuPoint:
     """A point in local East-North-Up coordinates.
     
@@ -154,7 +165,18 @@ def make_waypoint(
         )
     """
     # Auto-compute heading/pitch from look_at if provided
-    if look_at is not None:
+    if look_at is not None and heading_deg is None and pitch_deg is None:
+        if _geo_numba.NUMBA_AVAILABLE:
+            # One compiled call for both angles
+            heading_deg, pitch_deg = _geo_numba.heading_pitch(
+                position.lat, position.lon, position.alt,
+                look_at.lat, look_at.lon, look_at.alt,
+                EARTH_EQUATORIAL_RADIUS_M, _E_SQ,
+            )
+        else:
+            # One frame setup and ENU conversion for both angles
+            heading_deg, pitch_deg, _ = look_at_solve(position, look_at)
+    elif look_at is not None:
         if heading_deg is None:
             heading_deg = heading_between(position, look_at)
         if pitch_deg is None:
@@ -177,10 +199,120 @@ def make_waypoint(
     }
 
 
+def make_waypoints_batch(
+    positions: Sequence[GpsPoint],
+    look_at: GpsPoint,
+    speed_mps: float = DEFAULT_SPEED_MPS,
+    photo: bool = False,
+) -> List[dict]:
+    """Create waypoint dicts for many positions that all look at the same target.
+    
+    Equivalent to calling make_waypoint(position, look_at=look_at, ...) for each position,
+    but computes every heading and pitch in one vectorized NumPy pass. Useful for surveys
+    and orbits with thousands of waypoints. NumPy is optional: without it, this falls back
+    to the per-waypoint loop.
+    
+    Args:
+        positions: GPS positions of the drone, in flight order
+        look_at: Target GPS point every waypoint faces
+        speed_mps: Flight speed in meters per second
+        photo: Whether to take a photo at each waypoint
+        
+    Returns:
+        List of waypoint dicts, same format as make_waypoint()
+    
+    Example:
+        target = GpsPoint(lat=37.7897, lon=-122.3972, alt=50)
+        frame = LocalFrame(target)
+        positions = [
+            frame.enu_to_gps(EnuPoint(east=80 * math.cos(a), north=80 * math.sin(a), up=100))
+            for a in (math.radians(i) for i in range(0, 360, 10))
+        ]
+        waypoints = make_waypoints_batch(positions, look_at=target, photo=True)
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [
+            make_waypoint(position, look_at=look_at, speed_mps=speed_mps, photo=photo)
+            for position in positions
+        ]
+    
+    if not positions:
+        return []
+    
+    lats = np.fromiter((p.lat for p in positions), dtype=np.float64, count=len(positions))
+    lons = np.fromiter((p.lon for p in positions), dtype=np.float64, count=len(positions))
+    alts = np.fromiter((p.alt for p in positions), dtype=np.float64, count=len(positions))
+    
+    # Offsets of every position from the target, in the target's frame
+    target_frame = LocalFrame(look_at)
+    east, north, up = target_frame.gps_to_enu_batch(lats, lons, alts)
+    
+    # Rescale to each position's own frame and flip the direction, giving
+    # LocalFrame(position).gps_to_enu(look_at) for every position at once
+    # (0.0 - x rather than -x keeps zero offsets at +0.0, as atan2 expects)
+    m_per_deg = np.array([_frame_coeffs(p.lat)[2:] for p in positions])
+    east = 0.0 - east * (m_per_deg[:, 1] / target_frame._m_per_deg_lon)
+    north = 0.0 - north * (m_per_deg[:, 0] / target_frame._m_per_deg_lat)
+    up = 0.0 - up
+    
+    headings = np.degrees(np.arctan2(north, east)) % 360.0
+    
+    # Directly above/below the target (see pitch_to_target)
+    horizontal_dist = np.hypot(east, north)
+    pitches = np.where(
+        horizontal_dist < 0.001,
+        np.where(up < 0, 90.0, -90.0),
+        -np.degrees(np.arctan2(up, horizontal_dist)),
+    )
+    
+    return [
+        {
+            "latitude_deg": position.lat,
+            "longitude_deg": position.lon,
+            "altitude_m": position.alt,
+            "heading_deg": heading_deg,
+            "pitch_deg": pitch_deg,
+            "speed_mps": speed_mps,
+            "photo": photo,
+        }
+        for position, heading_deg, pitch_deg in zip(positions, headings.tolist(), pitches.tolist())
+    ]
+
+
 # =============================================================================
 # Local Coordinate Frame
 # =============================================================================
 
+@functools.lru_cache(maxsize=256)
+def _frame_coeffs(lat: float) -> tuple:
+    """WGS84 radii of curvature and meters-per-degree at a latitude.
+    
+    They depend only on the latitude, so frames built at the same latitude (e.g. one
+    per waypoint around a shared target) reuse them.
+    
+    Returns:
+        Tuple (N, M, m_per_deg_lat, m_per_deg_lon)
+    """
+    lat_rad = math.radians(lat)
+    sin_lat = math.sin(lat_rad)
+    cos_lat = math.cos(lat_rad)
+    
+    # Shared by both radii: w ** 0.5 and w ** 1.5 from a single sqrt
+    w = 1.0 - _E_SQ * sin_lat * sin_lat
+    sqrt_w = math.sqrt(w)
+    
+    # Prime vertical radius of curvature (east-west)
+    n = EARTH_EQUATORIAL_RADIUS_M / sqrt_w
+    
+    # Meridional radius of curvature (north-south)
+    m = EARTH_EQUATORIAL_RADIUS_M * (1.0 - _E_SQ) / (w * sqrt_w)
+    
+    # Meters per degree at this latitude
+    return n, m, _RAD_PER_DEG * m, _RAD_PER_DEG * n * cos_lat
+
+
 class LocalFrame:
     """Local coordinate frame for GPS ↔ ENU conversions.
     
@@ -206,21 +338,11 @@ class LocalFrame:
             origin: The GPS point that becomes (0, 0, 0) in ENU coordinates
         """
         self.origin = origin
-        lat_rad = math.radians(origin.lat)
-        
-        # WGS84 radii of curvature at this latitude
-        sin_lat = math.sin(lat_rad)
-        cos_lat = math.cos(lat_rad)
-        
-        # Prime vertical radius of curvature (east-west)
-        self._N = EARTH_EQUATORIAL_RADIUS_M / math.sqrt(1 - _E_SQ * sin_lat ** 2)
-        
-        # Meridional radius of curvature (north-south)
-        self._M = EARTH_EQUATORIAL_RADIUS_M * (1 - _E_SQ) / (1 - _E_SQ * sin_lat ** 2) ** 1.5
-        
-        # Meters per degree at this latitude
-        self._m_per_deg_lat = math.radians(1) * self._M
-        self._m_per_deg_lon = math.radians(1) * self._N * cos_lat
+        # Origin components, read once per conversion instead of through self.origin
+        self._lat0 = origin.lat
+        self._lon0 = origin.lon
+        self._alt0 = origin.alt
+        self._N, self._M, self._m_per_deg_lat, self._m_per_deg_lon = _frame_coeffs(origin.lat)
     
     def gps_to_enu(self, point: GpsPoint) -> EnuPoint:
         """Convert GPS coordinates to local ENU meters.
@@ -231,9 +353,9 @@ class LocalFrame:
         Returns:
             EnuPoint with east, north, up offsets from origin
         """
-        dlat = point.lat - self.origin.lat
-        dlon = point.lon - self.origin.lon
-        dalt = point.alt - self.origin.alt
+        dlat = point.lat - self._lat0
+        dlon = point.lon - self._lon0
+        dalt = point.alt - self._alt0
         
         east = dlon * self._m_per_deg_lon
         north = dlat * self._m_per_deg_lat
@@ -253,18 +375,60 @@ class LocalFrame:
         dlat = point.north / self._m_per_deg_lat
         dlon = point.east / self._m_per_deg_lon
         
-        lat = self.origin.lat + dlat
-        lon = self.origin.lon + dlon
-        alt = self.origin.alt + point.up
+        lat = self._lat0 + dlat
+        lon = self._lon0 + dlon
+        alt = self._alt0 + point.up
         
         return GpsPoint(lat=lat, lon=lon, alt=alt)
+    
+    def gps_to_enu_batch(self, lats, lons, alts):
+        """Convert many GPS coordinates to local ENU meters at once.
+        
+        Vectorized version of gps_to_enu() for large missions. Requires NumPy.
+        
+        Args:
+            lats: Latitudes in degrees (array-like)
+            lons: Longitudes in degrees (array-like)
+            alts: Altitudes in meters (array-like)
+            
+        Returns:
+            Tuple of NumPy arrays (east, north, up) with offsets from origin
+        """
+        import numpy as np
+        
+        east = (np.asarray(lons, dtype=np.float64) - self._lon0) * self._m_per_deg_lon
+        north = (np.asarray(lats, dtype=np.float64) - self._lat0) * self._m_per_deg_lat
+        up = np.asarray(alts, dtype=np.float64) - self._alt0
+        return east, north, up
+    
+    def enu_to_gps_batch(self, east, north, up):
+        """Convert many local ENU points to GPS coordinates at once.
+        
+        Vectorized version of enu_to_gps() for large missions. Requires NumPy.
+        
+        Args:
+            east: East offsets in meters (array-like)
+            north: North offsets in meters (array-like)
+            up: Up offsets in meters (array-like)
+            
+        Returns:
+            Tuple of NumPy arrays (lats, lons, alts)
+        """
+        import numpy as np
+        
+        lats = self._lat0 + np.asarray(north, dtype=np.float64) / self._m_per_deg_lat
+        lons = self._lon0 + np.asarray(east, dtype=np.float64) / self._m_per_deg_lon
+        alts = self._alt0 + np.asarray(up, dtype=np.float64)
+        return lats, lons, alts
 
 
 # =============================================================================
 # Heading and Pitch Calculations
 # =============================================================================
 
-def heading_between(from_point: GpsPoint, to_point: GpsPoint) -> float:
+def heading_between(
+    from_point: GpsPoint, to_point: GpsPoint, frame: Optional[LocalFrame] = None
+) -> float:
     """Compute ENU heading from one GPS point to another.
     
     ENU Convention:
@@ -276,6 +440,7 @@ def heading_between(from_point: GpsPoint, to_point: GpsPoint) -> float:
     Args:
         from_point: Starting GPS position (where drone is)
         to_point: Target GPS position (what drone looks at)
+        frame: Optional LocalFrame centered on from_point, to reuse across calls
         
     Returns:
         Heading in degrees [0, 360) in ENU convention
@@ -285,18 +450,26 @@ def heading_between(from_point: GpsPoint, to_point: GpsPoint) -> float:
         target = GpsPoint(lat=37.7897, lon=-122.3972, alt=50)
         heading = heading_between(drone, target)  # Returns heading to face target
     """
-    frame = LocalFrame(from_point)
-    enu = frame.gps_to_enu(to_point)
+    # Only the horizontal offset is needed, so use the cached scale factors directly
+    # rather than building a frame and an EnuPoint
+    if frame is None:
+        _, _, m_per_deg_lat, m_per_deg_lon = _frame_coeffs(from_point.lat)
+    else:
+        m_per_deg_lat, m_per_deg_lon = frame._m_per_deg_lat, frame._m_per_deg_lon
+    east = (to_point.lon - from_point.lon) * m_per_deg_lon
+    north = (to_point.lat - from_point.lat) * m_per_deg_lat
     
     # atan2(north, east) gives angle from east axis
-    angle_rad = math.atan2(enu.north, enu.east)
+    angle_rad = math.atan2(north, east)
     angle_deg = math.degrees(angle_rad)
     
     # Normalize to [0, 360)
-    return angle_deg % 360.0
+    return _wrap360(angle_deg)
 
 
-def pitch_to_target(from_point: GpsPoint, to_point: GpsPoint) -> float:
+def pitch_to_target(
+    from_point: GpsPoint, to_point: GpsPoint, frame: Optional[LocalFrame] = None
+) -> float:
     """Compute gimbal pitch to look at a target.
     
     Gimbal Pitch Convention:
@@ -307,6 +480,7 @@ def pitch_to_target(from_point: GpsPoint, to_point: GpsPoint) -> float:
     Args:
         from_point: Camera GPS position (where drone is)
         to_point: Target GPS position (what drone looks at)
+        frame: Optional LocalFrame centered on from_point, to reuse across calls
         
     Returns:
         Pitch in degrees (positive = looking down)
@@ -316,10 +490,11 @@ def pitch_to_target(from_point: GpsPoint, to_point: GpsPoint) -> float:
         target = GpsPoint(lat=37.7897, lon=-122.3972, alt=50)  # 50m below
         pitch = pitch_to_target(drone, target)  # Returns positive (looking down)
     """
-    frame = LocalFrame(from_point)
+    if frame is None:
+        frame = LocalFrame(from_point)
     enu = frame.gps_to_enu(to_point)
     
-    horizontal_dist = math.sqrt(enu.east ** 2 + enu.north ** 2)
+    horizontal_dist = math.hypot(enu.east, enu.north)
     vertical_dist = enu.up
     
     if horizontal_dist < 0.001:  # Very close horizontally
@@ -329,12 +504,98 @@ def pitch_to_target(from_point: GpsPoint, to_point: GpsPoint) -> float:
     return -math.degrees(pitch_rad)
 
 
-def distance_between(point1: GpsPoint, point2: GpsPoint) -> float:
+def look_at_solve(
+    from_point: GpsPoint, to_point: GpsPoint, frame: Optional[LocalFrame] = None
+) -> tuple:
+    """Compute heading, gimbal pitch and distance from one GPS point to another at once.
+    
+    Same results as heading_between(), pitch_to_target() and distance_between(), but the
+    frame and ENU offset are computed once for all three.
+    
+    Args:
+        from_point: Camera GPS position (where drone is)
+        to_point: Target GPS position (what drone looks at)
+        frame: Optional LocalFrame centered on from_point, to reuse across calls
+        
+    Returns:
+        Tuple (heading_deg, pitch_deg, distance_m): ENU heading in [0, 360), gimbal pitch
+        (positive = looking down), and 3D distance in meters
+    
+    Example:
+        drone = GpsPoint(lat=37.79, lon=-122.40, alt=100)
+        target = GpsPoint(lat=37.7897, lon=-122.3972, alt=50)
+        heading, pitch, dist = look_at_solve(drone, target)
+    """
+    if frame is None:
+        frame = LocalFrame(from_point)
+    enu = frame.gps_to_enu(to_point)
+    
+    heading_deg = _wrap360(math.degrees(math.atan2(enu.north, enu.east)))
+    
+    horizontal_dist = math.hypot(enu.east, enu.north)
+    if horizontal_dist < 0.001:  # Very close horizontally
+        pitch_deg = 90.0 if enu.up < 0 else -90.0
+    else:
+        pitch_deg = -math.degrees(math.atan2(enu.up, horizontal_dist))
+    
+    distance_m = math.hypot(enu.east, enu.north, enu.up)
+    return heading_deg, pitch_deg, distance_m
+
+
+def look_at_solve_batch(from_points: Sequence[GpsPoint], to_points: Sequence[GpsPoint]) -> List[tuple]:
+    """Run look_at_solve() over many point pairs.
+    
+    With Numba installed, all pairs are solved in a single compiled loop (see _geo_numba.py);
+    results then match look_at_solve() up to floating-point rounding. Without Numba this is
+    a plain loop over look_at_solve().
+    
+    Args:
+        from_points: Camera GPS positions (where drone is)
+        to_points: Target GPS positions, one per from_point
+        
+    Returns:
+        List of (heading_deg, pitch_deg, distance_m) tuples, one per pair
+    
+    Raises:
+        ValueError: If from_points and to_points have different lengths
+    
+    Example:
+        target = GpsPoint(lat=37.7897, lon=-122.3972, alt=50)
+        solved = look_at_solve_batch(positions, [target] * len(positions))
+    """
+    if len(from_points) != len(to_points):
+        raise ValueError(
+            f"from_points and to_points must have the same length "
+            f"({len(from_points)} != {len(to_points)})"
+        )
+    
+    if not _geo_numba.NUMBA_AVAILABLE:
+        return [look_at_solve(f, t) for f, t in zip(from_points, to_points)]
+    
+    import numpy as np  # Numba depends on NumPy, so it is installed here
+    
+    n = len(from_points)
+    columns = [
+        np.fromiter((getattr(p, attr) for p in points), dtype=np.float64, count=n)
+        for points in (from_points, to_points)
+        for attr in ("lat", "lon", "alt")
+    ]
+    headings, pitches, distances = np.empty(n), np.empty(n), np.empty(n)
+    _geo_numba.look_at_solve_batch(
+        *columns, EARTH_EQUATORIAL_RADIUS_M, _E_SQ, headings, pitches, distances
+    )
+    return list(zip(headings.tolist(), pitches.tolist(), distances.tolist()))
+
+
+def distance_between(
+    point1: GpsPoint, point2: GpsPoint, frame: Optional[LocalFrame] = None
+) -> float:
     """Compute 3D distance between two GPS points in meters.
     
     Args:
         point1: First GPS point
         point2: Second GPS point
+        frame: Optional LocalFrame centered on point1, to reuse across calls
         
     Returns:
         Distance in meters
@@ -344,9 +605,52 @@ def distance_between(point1: GpsPoint, point2: GpsPoint) -> float:
         p2 = GpsPoint(lat=37.7897, lon=-122.3972, alt=100)
         dist = distance_between(p1, p2)  # Returns ~330m
     """
-    frame = LocalFrame(point1)
+    if point1 == point2:
+        return 0.0
+    if frame is None:
+        frame = LocalFrame(point1)
     enu = frame.gps_to_enu(point2)
-    return math.sqrt(enu.east ** 2 + enu.north ** 2 + enu.up ** 2)
+    return math.hypot(enu.east, enu.north, enu.up)
+
+
+def distance_squared_between(
+    point1: GpsPoint, point2: GpsPoint, frame: Optional[LocalFrame] = None
+) -> float:
+    """Compute the squared 3D distance between two GPS points in square meters.
+    
+    Cheaper than distance_between() (no square root). Use it when distances are only
+    compared, e.g. nearest-waypoint searches or threshold checks against threshold ** 2.
+    
+    Args:
+        point1: First GPS point
+        point2: Second GPS point
+        frame: Optional LocalFrame centered on point1, to reuse across calls
+        
+    Returns:
+        Squared distance in square meters
+    
+    Example:
+        # Is the drone within 50m of the target?
+        close = distance_squared_between(drone, target) < 50 ** 2
+    """
+    if point1 == point2:
+        return 0.0
+    if frame is None:
+        frame = LocalFrame(point1)
+    enu = frame.gps_to_enu(point2)
+    return enu.east * enu.east + enu.north * enu.north + enu.up * enu.up
+
+
+def _wrap360(angle_deg: float) -> float:
+    """Wrap an angle in (-360, 720) to [0, 360) without the division done by float %.
+    
+    Only for angles known to be in that range (e.g. from atan2); use % 360 for arbitrary input.
+    """
+    if angle_deg < 0.0:
+        return angle_deg + 360.0
+    if angle_deg >= 360.0:
+        return angle_deg - 360.0
+    return angle_deg
 
 
 # =============================================================================
@@ -392,13 +696,8 @@ def enu_to_compass(enu_deg: float) -> float:
 # Angle Utilities
 # =============================================================================
 
-def deg_to_rad(degrees: float) -> float:
-    """Convert degrees to radians."""
-    return math.radians(degrees)
-
-
-def rad_to_deg(radians: float) -> float:
-    """Convert radians to degrees."""
-    return math.degrees(radians)
+# Aliases of the C functions, so callers skip a Python-level wrapper call
+deg_to_rad = math.radians  # Convert degrees to radians
+rad_to_deg = math.degrees  # Convert radians to degrees
 
 
@@ -13,6 +13,30 @@ import os
 
 from mission_helpers import build_mission
 
+# orjson serializes large mission payloads several times faster than the stdlib json module;
+# it is optional and json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json_file(path, obj):
+    """Write obj to path as JSON indented by two spaces"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+
+def dumps_compact(obj):
+    """Serialize obj to compact JSON text"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -57,8 +81,7 @@ def main():
     # Save mission to JSON file if output-mission is specified
     if args.output_mission:
         mission_dict = mission.to_dict()
-        with open(args.output_mission, "w") as f:
-            json.dump(mission_dict, f, indent=2)
+        write_json_file(args.output_mission, mission_dict)
         print(f"Saved mission to {args.output_mission}")
 
     # Build the full request body (needed for --output-body, --output-curl-sh, and --upload)
@@ -81,23 +104,34 @@ def main():
         )
         body_dict = body.to_dict()
 
+        # Serialize once for both the curl script and the upload
+        body_json = None
+        if args.output_curl_sh or args.upload:
+            body_json = dumps_compact(body_dict)
+
         # Save request body to file if specified
         if args.output_body:
-            with open(args.output_body, "w") as f:
-                json.dump(body_dict, f, indent=2)
+            write_json_file(args.output_body, body_dict)
             print(f"Saved request body to {args.output_body}")
 
-        # Save curl command to file if specified
+        # Save curl command to file if specified. The body goes in a file next to the script
+        # (passed with --data-binary @file) so large missions don't end up inline in the script.
         if args.output_curl_sh:
+            curl_body_file = f"{args.output_curl_sh}.body.json"
+            with open(curl_body_file, "w") as f:
+                f.write(body_json)
+            print(f"Saved curl request body to {curl_body_file}")
+
             curl_script = f"""#!/bin/bash
 # Curl command to upload mission to Skydio API
-# Usage: ./{args.output_curl_sh}
+# Usage: chmod +x {args.output_curl_sh} && ./{args.output_curl_sh}
 # Requires API_TOKEN environment variable to be set
+# Sends the request body from {os.path.basename(curl_body_file)} (kept next to this script)
 
 curl -X POST "https://api.skydio.com/api/v1/mission_document/template" \\
   -H "Authorization: $API_TOKEN" \\
   -H "Content-Type: application/json" \\
-  -d '{json.dumps(body_dict)}'
+  --data-binary @"$(dirname "$0")/{os.path.basename(curl_body_file)}"
 """
             with open(args.output_curl_sh, "w") as f:
                 f.write(curl_script)
@@ -117,10 +151,18 @@ curl -X POST "https://api.skydio.com/api/v1/mission_document/template" \\
                 print(f"Error: SDK not available. Run 'python generate_sdk.py' first.\n{e}")
                 return
 
+            # Use HTTP/2 when httpx's optional h2 dependency is installed (pip install "httpx[http2]")
+            try:
+                import h2  # noqa: F401
+                httpx_args = {"http2": True}
+            except ImportError:
+                httpx_args = {}
+
             client = AuthenticatedClient(
                 base_url="https://api.skydio.com/api",
                 token=api_token,
                 prefix="",  # Skydio API uses token directly without Bearer prefix
+                httpx_args=httpx_args,
             )
 
             with client:
@@ -128,7 +170,7 @@ curl -X POST "https://api.skydio.com/api/v1/mission_document/template" \\
                 httpx_client = client.get_httpx_client()
                 response = httpx_client.post(
                     "/v1/mission_document/template",
-                    json=body_dict,
+                    content=body_json.encode("utf-8"),
                     headers={"Content-Type": "application/json"},
                 )
                 print(f"\nResponse status: {response.status_code}")
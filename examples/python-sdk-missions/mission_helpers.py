@@ -24,23 +24,86 @@ Usage:
         gps = frame.enu_to_gps(enu)
         waypoints.append(make_waypoint(position=gps, look_at=target, photo=True))
     
+    # Or build the same orbit in one vectorized pass (requires NumPy)
+    import numpy as np
+    from geo import make_waypoints_batch
+    
+    angles = np.radians(np.arange(0, 360, 10))
+    lats, lons, alts = frame.enu_to_gps_batch(
+        80 * np.cos(angles), 80 * np.sin(angles), np.full(angles.shape, 100.0)
+    )
+    positions = [GpsPoint(lat, lon, alt) for lat, lon, alt in zip(lats.tolist(), lons.tolist(), alts.tolist())]
+    waypoints = make_waypoints_batch(positions, look_at=target, photo=True)
+    
     # Build mission (requires SDK)
     mission = build_mission(waypoints, name="Orbit Mission")
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Iterable, List, Tuple
 
-from geo import deg_to_rad
+from geo import _RAD_PER_DEG
 
 if TYPE_CHECKING:
-    from skydio_client.models import Mission
+    from skydio_client.models import Action, Mission
+
+# The generated SDK models, imported once. The SDK may not be generated yet, so failures are
+# kept and raised from build_mission with a hint instead of breaking this module's import.
+try:
+    from skydio_client import models as _SDK
+    _SDK_IMPORT_ERROR = None
+except (ImportError, ModuleNotFoundError, TypeError) as e:
+    _SDK = None
+    _SDK_IMPORT_ERROR = e
+
+
+_OPEN_ELEVATION_URL = "https://api.open-elevation.com/api/v1/lookup"
+
+# Shared HTTP client, created on first lookup so repeated lookups reuse the HTTPS connection.
+# httpx is already installed as a dependency of the generated SDK.
+_http_client = None
+
+
+def _get_http_client():
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.Client()
+    return _http_client
+
+
+def get_terrain_elevations(points: List[Tuple[float, float]], timeout: float = 10.0) -> List[float]:
+    """Look up terrain elevation MSL at several GPS coordinates in one request.
+    
+    Uses the free Open-Elevation API (POST lookup). No API key required.
+    
+    Args:
+        points: List of (lat, lon) tuples in degrees
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Terrain elevations in meters above mean sea level (MSL), in the same order as points
+        
+    Raises:
+        RuntimeError: If the API request fails
+    
+    Example:
+        elevs = get_terrain_elevations([(40.03045, -82.99777), (40.03100, -82.99700)])
+    """
+    body = {"locations": [{"latitude": lat, "longitude": lon} for lat, lon in points]}
+    try:
+        response = _get_http_client().post(_OPEN_ELEVATION_URL, json=body, timeout=timeout)
+        response.raise_for_status()
+        return [result["elevation"] for result in response.json()["results"]]
+    except Exception as e:
+        raise RuntimeError(f"Failed to get terrain elevation: {e}") from e
 
 
 def get_terrain_elevation(lat: float, lon: float, timeout: float = 10.0) -> float:
     """Look up terrain elevation MSL at a GPS coordinate.
     
     Uses the free Open-Elevation API. No API key required.
+    For several coordinates, use get_terrain_elevations() to look them up in one request.
     
     Args:
         lat: Latitude in degrees
@@ -57,19 +120,108 @@ def get_terrain_elevation(lat: float, lon: float, timeout: float = 10.0) -> floa
         # Ohio farmland
         elev = get_terrain_elevation(40.03045, -82.99777)  # Returns ~250m
     """
-    import requests
-    
-    url = f"https://api.open-elevation.com/api/v1/lookup?locations={lat},{lon}"
+    return get_terrain_elevations([(lat, lon)], timeout=timeout)[0]
+
+
+# Pieces that are identical in every waypoint sequence, built once and shared by all of them
+# (they are never modified after construction). An SDK generated from a different spec may
+# lack some of these models or arguments; that is reported from build_mission like a failed import.
+if _SDK is not None:
     try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
-        return response.json()["results"][0]["elevation"]
-    except Exception as e:
-        raise RuntimeError(f"Failed to get terrain elevation: {e}") from e
+        _OA_DEFAULT_ACTION = _SDK.Action(
+            action_key="SetObstacleAvoidance",
+            args=_SDK.SkillsActionArgsSetObstacleAvoidance(
+                set_obstacle_avoidance=_SDK.SetObstacleAvoidanceActionArgs(
+                    oa_setting=_SDK.SetObstacleAvoidanceActionArgsOaSetting.DEFAULT
+                )
+            ),
+        )
+        _STOP_VIDEO_ACTION = _SDK.Action(
+            action_key="StopVideo",
+            args=_SDK.SkillsActionArgsStopVideo(
+                stop_video=_SDK.StopVideoActionArgs(no_args=False)
+            ),
+        )
+        _TAKE_PHOTO_ACTION = _SDK.Action(
+            action_key="TakePhoto",
+            args=_SDK.SkillsActionArgsTakePhoto(
+                take_photo=_SDK.TakePhotoActionArgs(
+                    camera_settings=_SDK.CameraSettings(
+                        recording_mode=_SDK.CameraSettingsRecordingMode.PHOTO_DEFAULT,
+                    ),
+                ),
+                is_skippable=True,
+            ),
+        )
+        # Only the traversal speed varies between waypoints' motion args
+        _LOOK_AT_ARGS = _SDK.LookAtMotionArgs(
+            heading_mode=_SDK.LookAtMotionArgsHeadingMode.CONSTANT_END,
+            gimbal_pitch_mode=_SDK.LookAtMotionArgsGimbalPitchMode.CONSTANT_END,
+        )
+    except (AttributeError, TypeError) as e:
+        _SDK = None
+        _SDK_IMPORT_ERROR = e
+
+
+def _create_waypoint_sequence(wp_dict: dict) -> Action:
+    """Create action sequence for a single waypoint."""
+    waypoint_obj = _SDK.Waypoint(
+        xy=_SDK.PositionXy(
+            frame=_SDK.PositionXyFrame.GPS,
+            x=wp_dict["latitude_deg"],
+            y=wp_dict["longitude_deg"],
+        ),
+        z=_SDK.PositionZ(
+            frame=_SDK.PositionZFrame.WORLD_TAKEOFF,
+            value=wp_dict["altitude_m"],
+        ),
+        heading=_SDK.Heading(
+            value=wp_dict["heading_deg"] * _RAD_PER_DEG,
+            frame=_SDK.HeadingFrame.GPS,
+        ),
+        gimbal_pitch=_SDK.GimbalPitch(value=wp_dict["pitch_deg"] * _RAD_PER_DEG),
+    )
+    
+    motion_args = _SDK.MotionArgs(
+        traversal_args=_SDK.TraversalMotionArgs(
+            height_mode=_SDK.TraversalMotionArgsHeightMode.CONSTANT_END,
+            speed=wp_dict.get("speed_mps", 5.0),
+        ),
+        look_at_args=_LOOK_AT_ARGS,
+    )
+    
+    actions = [
+        _OA_DEFAULT_ACTION,
+        _STOP_VIDEO_ACTION,
+        _SDK.Action(
+            action_key="GotoWaypoint",
+            args=_SDK.SkillsActionArgsGotoWaypoint(
+                goto_waypoint=_SDK.GotoWaypointActionArgs(
+                    waypoint=waypoint_obj,
+                    motion_args=motion_args,
+                )
+            ),
+        ),
+    ]
+    
+    if wp_dict.get("photo", False):
+        actions.append(_TAKE_PHOTO_ACTION)
+    
+    actions.append(_OA_DEFAULT_ACTION)
+    
+    return _SDK.Action(
+        action_key="Sequence",
+        args=_SDK.SkillsActionArgsSequence(
+            sequence=_SDK.SkillsSequenceActionArgs(
+                name="",
+                actions=actions,
+            )
+        ),
+    )
 
 
 def build_mission(
-    waypoints: List[dict],
+    waypoints: Iterable[dict],
     name: str = "Mission",
     terrain_elevation_msl: float = None,
     auto_start: bool = True,
@@ -83,7 +235,7 @@ def build_mission(
     missions may appear underground in the Cloud visualization.
     
     Args:
-        waypoints: List of dicts with keys:
+        waypoints: List (or any iterable, e.g. a generator) of dicts with keys:
             - latitude_deg, longitude_deg, altitude_m
             - heading_deg (ENU: 0=East, 90=North)
             - pitch_deg (0=level, +90=down)
@@ -116,163 +268,34 @@ def build_mission(
         # Option 2: Provide terrain elevation manually
         mission = build_mission(waypoints, name="My Mission", terrain_elevation_msl=250.0)
     """
-    # Validate input
-    if not waypoints:
+    # Validate input; waypoints may be a one-shot iterator, so it is only iterated once
+    waypoints = iter(waypoints)
+    first_wp = next(waypoints, None)
+    if first_wp is None:
         raise ValueError("waypoints list cannot be empty")
 
-    # Deferred import - gives helpful error if SDK not generated
-    try:
-        from skydio_client.models import (
-            Action,
-            CameraSettings,
-            Mission,
-            GpsOriginInfo,
-            GotoWaypointActionArgs,
-            Waypoint,
-            PositionXy,
-            PositionZ,
-            Heading,
-            GimbalPitch,
-            MotionArgs,
-            TraversalMotionArgs,
-            LookAtMotionArgs,
-            SetObstacleAvoidanceActionArgs,
-            StopVideoActionArgs,
-            TakePhotoActionArgs,
-            ReturnSettings,
-            SkillsActionArgsGotoWaypoint,
-            SkillsActionArgsSequence,
-            SkillsActionArgsSetObstacleAvoidance,
-            SkillsActionArgsStopVideo,
-            SkillsActionArgsTakePhoto,
-            SkillsSequenceActionArgs,
-            # Enum types
-            SetObstacleAvoidanceActionArgsOaSetting,
-            PositionXyFrame,
-            PositionZFrame,
-            HeadingFrame,
-            TraversalMotionArgsHeightMode,
-            LookAtMotionArgsHeadingMode,
-            LookAtMotionArgsGimbalPitchMode,
-            CameraSettingsRecordingMode,
-            MissionLostConnectionAction,
-            MissionPostFailureAction,
-            MissionPostMissionAction,
-        )
-    except (ImportError, ModuleNotFoundError, TypeError) as e:
+    if _SDK is None:
         raise ImportError(
             "Skydio SDK not available. Please run 'python generate_sdk.py' first.\n"
-            f"Original error: {e}"
-        ) from e
+            f"Original error: {_SDK_IMPORT_ERROR}"
+        ) from _SDK_IMPORT_ERROR
     
     # Get terrain elevation at first waypoint if not provided
-    first_wp = waypoints[0]
     origin_lat = first_wp["latitude_deg"]
     origin_lon = first_wp["longitude_deg"]
     
     if terrain_elevation_msl is None:
         terrain_elevation_msl = get_terrain_elevation(origin_lat, origin_lon)
     
-    def create_waypoint_sequence(wp_dict: dict) -> Action:
-        """Create action sequence for a single waypoint."""
-        waypoint_obj = Waypoint(
-            xy=PositionXy(
-                frame=PositionXyFrame.GPS,
-                x=wp_dict["latitude_deg"],
-                y=wp_dict["longitude_deg"],
-            ),
-            z=PositionZ(
-                frame=PositionZFrame.WORLD_TAKEOFF,
-                value=wp_dict["altitude_m"],
-            ),
-            heading=Heading(
-                value=deg_to_rad(wp_dict["heading_deg"]),
-                frame=HeadingFrame.GPS,
-            ),
-            gimbal_pitch=GimbalPitch(value=deg_to_rad(wp_dict["pitch_deg"])),
-        )
-        
-        motion_args = MotionArgs(
-            traversal_args=TraversalMotionArgs(
-                height_mode=TraversalMotionArgsHeightMode.CONSTANT_END,
-                speed=wp_dict.get("speed_mps", 5.0),
-            ),
-            look_at_args=LookAtMotionArgs(
-                heading_mode=LookAtMotionArgsHeadingMode.CONSTANT_END,
-                gimbal_pitch_mode=LookAtMotionArgsGimbalPitchMode.CONSTANT_END,
-            ),
-        )
-        
-        actions = [
-            Action(
-                action_key="SetObstacleAvoidance",
-                args=SkillsActionArgsSetObstacleAvoidance(
-                    set_obstacle_avoidance=SetObstacleAvoidanceActionArgs(
-                        oa_setting=SetObstacleAvoidanceActionArgsOaSetting.DEFAULT
-                    )
-                ),
-            ),
-            Action(
-                action_key="StopVideo",
-                args=SkillsActionArgsStopVideo(
-                    stop_video=StopVideoActionArgs(no_args=False)
-                ),
-            ),
-            Action(
-                action_key="GotoWaypoint",
-                args=SkillsActionArgsGotoWaypoint(
-                    goto_waypoint=GotoWaypointActionArgs(
-                        waypoint=waypoint_obj,
-                        motion_args=motion_args,
-                    )
-                ),
-            ),
-        ]
-        
-        if wp_dict.get("photo", False):
-            actions.append(
-                Action(
-                    action_key="TakePhoto",
-                    args=SkillsActionArgsTakePhoto(
-                        take_photo=TakePhotoActionArgs(
-                            camera_settings=CameraSettings(
-                                recording_mode=CameraSettingsRecordingMode.PHOTO_DEFAULT,
-                            ),
-                        ),
-                        is_skippable=True,
-                    ),
-                )
-            )
-        
-        actions.append(
-            Action(
-                action_key="SetObstacleAvoidance",
-                args=SkillsActionArgsSetObstacleAvoidance(
-                    set_obstacle_avoidance=SetObstacleAvoidanceActionArgs(
-                        oa_setting=SetObstacleAvoidanceActionArgsOaSetting.DEFAULT
-                    )
-                ),
-            )
-        )
-        
-        return Action(
-            action_key="Sequence",
-            args=SkillsActionArgsSequence(
-                sequence=SkillsSequenceActionArgs(
-                    name="",
-                    actions=actions,
-                )
-            ),
-        )
-    
     # Build all waypoint sequences
-    waypoint_sequences = [create_waypoint_sequence(wp) for wp in waypoints]
+    waypoint_sequences = [_create_waypoint_sequence(first_wp)]
+    waypoint_sequences.extend(_create_waypoint_sequence(wp) for wp in waypoints)
     
     # Wrap in root sequence
-    root_sequence = Action(
+    root_sequence = _SDK.Action(
         action_key="Sequence",
-        args=SkillsActionArgsSequence(
-            sequence=SkillsSequenceActionArgs(
+        args=_SDK.SkillsActionArgsSequence(
+            sequence=_SDK.SkillsSequenceActionArgs(
                 name="root_sequence",
                 actions=waypoint_sequences,
             )
@@ -280,9 +303,9 @@ def build_mission(
     )
     
     # Create mission with expected GPS origin for correct Cloud altitude display
-    return Mission(
+    return _SDK.Mission(
         display_name=name,
-        expected_gps_origin=GpsOriginInfo(
+        expected_gps_origin=_SDK.GpsOriginInfo(
             lat=origin_lat,
             lon=origin_lon,
             gps_altitude=terrain_elevation_msl,
@@ -291,10 +314,10 @@ def build_mission(
         actions=[root_sequence],
         auto_start=auto_start,
         dock_mission=True,
-        lost_connection_action=MissionLostConnectionAction.RETURN_TO_HOME,
-        post_failure_action=MissionPostFailureAction.DEFAULT_RETURN,
-        post_mission_action=MissionPostMissionAction.DEFAULT_RETURN,
-        rtx_settings=ReturnSettings(
+        lost_connection_action=_SDK.MissionLostConnectionAction.RETURN_TO_HOME,
+        post_failure_action=_SDK.MissionPostFailureAction.DEFAULT_RETURN,
+        post_mission_action=_SDK.MissionPostMissionAction.DEFAULT_RETURN,
+        rtx_settings=_SDK.ReturnSettings(
             wait_time=60,
             minimum_height=30,
             speed=5,
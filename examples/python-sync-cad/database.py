@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Index, inspect, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -11,6 +11,8 @@ Base = declarative_base()
 
 class CADEvent(Base):
     __tablename__ = "cad_events"
+    # (event_time, id) is the sync cursor: id breaks ties between events sharing a timestamp
+    __table_args__ = (Index("ix_cad_event_time", "event_time", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -22,6 +24,15 @@ class CADEvent(Base):
     category = Column(String, nullable=False)
 
 
+class SyncCursor(Base):
+    """Timestamp and id of the last event synced to a destination, so syncing resumes after a restart."""
+    __tablename__ = "sync_cursor"
+
+    name = Column(String, primary_key=True)
+    ts = Column(DateTime, nullable=False)
+    last_id = Column(Integer, nullable=False, default=0)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -31,6 +42,13 @@ def get_db():
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced since a database was created
+    for index in CADEvent.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    # Likewise for columns: cursors saved before last_id existed resume from id 0 at their timestamp
+    if "last_id" not in {column["name"] for column in inspect(engine).get_columns("sync_cursor")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE sync_cursor ADD COLUMN last_id INTEGER NOT NULL DEFAULT 0"))
 
 if __name__ == "__main__":
     init_db()
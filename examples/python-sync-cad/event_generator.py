@@ -1,5 +1,7 @@
+import os
 import time
 import random
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from database import SessionLocal, CADEvent
 
@@ -19,31 +21,42 @@ DESCRIPTIONS = [
     "A public disturbance has been reported by local residents."
 ]
 
+# (title, description, category) for each kind of event, so one random pick selects all three
+EVENTS = list(zip(TITLES, DESCRIPTIONS, CATEGORIES))
+
 # San Francisco Bay Area coordinates range
 LAT_RANGE = (37.5, 37.9)
 LON_RANGE = (-122.5, -122.0)
 
-def create_cad_event(db: Session):
-    idx = random.randint(0, len(TITLES) - 1)
-    event = CADEvent(
-        title=TITLES[idx],
-        latitude=random.uniform(*LAT_RANGE),
-        longitude=random.uniform(*LON_RANGE),
-        description=DESCRIPTIONS[idx],
-        category=CATEGORIES[idx]
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    print(f"Created event {event.id}: {event.title}")
-    return event
+# Number of events inserted per round. Raise it to seed larger volumes: each batch is a
+# single multi-row INSERT and one commit instead of a round trip per event.
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1"))
+
+def random_event_row():
+    title, description, category = random.choice(EVENTS)
+    return {
+        "title": title,
+        "latitude": random.uniform(*LAT_RANGE),
+        "longitude": random.uniform(*LON_RANGE),
+        "description": description,
+        "category": category,
+    }
+
+def generate_batch(db: Session, n: int):
+    rows = [random_event_row() for _ in range(n)]
+    with db.begin():
+        result = db.execute(insert(CADEvent).returning(CADEvent.id, CADEvent.title), rows)
+        created = result.all()
+    for event_id, title in created:
+        print(f"Created event {event_id}: {title}")
+    return created
 
 def main():
     print("Starting event generator...")
     db = SessionLocal()
     try:
         while True:
-            create_cad_event(db)
+            generate_batch(db, BATCH_SIZE)
             time.sleep(5)
     except KeyboardInterrupt:
         print("\nStopping event generator.")
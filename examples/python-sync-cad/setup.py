@@ -6,9 +6,8 @@ setup(
     packages=find_packages(),
         python_requires='>=3.8',
     install_requires=[
-        'SQLAlchemy',
+        'SQLAlchemy>=2.0',
         'requests',
         'python-dotenv',
-        'arrow',
     ],
 )
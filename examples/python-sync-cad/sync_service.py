@@ -1,12 +1,25 @@
+import json
 import os
+import random
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import arrow
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from datetime import datetime, timezone
-from typing import cast
+from typing import Optional, Tuple
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from database import SessionLocal, CADEvent
+from database import SessionLocal, CADEvent, SyncCursor, init_db
+
+# orjson serializes marker payloads faster than the stdlib json module; it is optional and
+# json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 load_dotenv()  # Load environment variables from .env file
 
@@ -16,29 +29,115 @@ SKYDIO_API_URL = os.getenv("SKYDIO_API_URL", "https://api.skydio.com/v1")
 if not SKYDIO_API_KEY:
     raise ValueError("SKYDIO_API_KEY must be set in the .env file.")
 
+# Polling backs off while the database is idle and snaps back as soon as events show up:
+# the wait doubles after every empty poll up to MAX_POLL_INTERVAL and resets to
+# MIN_POLL_INTERVAL whenever new events are found. Both can be tuned in .env to match how
+# bursty the CAD feed is.
+MIN_POLL_INTERVAL = float(os.getenv("MIN_POLL_INTERVAL", "0.5"))
+MAX_POLL_INTERVAL = float(os.getenv("MAX_POLL_INTERVAL", "30"))
+
+# Maximum number of events fetched per poll
+SYNC_BATCH_SIZE = 500
+
+# Row in the sync_cursor table that holds this service's progress
+CURSOR_NAME = "skydio"
+
 HEADERS = {
     "Authorization": SKYDIO_API_KEY,
     "accept": "application/json",
     "Content-Type": "application/json",
 }
 
+# Transient gateway/server errors are retried with backoff before a marker counts as failed.
+# POST is included explicitly (urllib3 skips it by default): a duplicate marker is preferable
+# to holding the cursor back on every pass.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+)
+
+# Shared session so every marker POST reuses a keep-alive connection instead of
+# opening a new TCP+TLS connection per event
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=RETRY))
+
+# Marker POSTs are network-bound, so up to MAX_WORKERS of them are kept in flight at once
+MAX_WORKERS = 8
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# IDs of recently synced events (LRU, oldest first) with the time they were synced, so an
+# event fetched again within the TTL is not posted as a duplicate marker
+RECENTLY_SYNCED_MAX = 10_000
+RECENTLY_SYNCED_TTL = 3600  # seconds
+_recently_synced: "OrderedDict[int, float]" = OrderedDict()
+
+# Outcomes of a marker POST. A REJECTED event (the API answered with an error, e.g. failed
+# validation) would be rejected again, so it is logged and passed over like a created one.
+# Only FAILED posts (network errors, 5xx after retries) hold the cursor back, for at most
+# MAX_POST_ATTEMPTS polls per event before it is given up on as well.
+CREATED, REJECTED, FAILED = "created", "rejected", "failed"
+MAX_POST_ATTEMPTS = 5
+_failed_attempts: "dict[int, int]" = {}
 
-def get_new_events(db: Session, last_synced: datetime):
+
+def get_new_events(db: Session, last_synced: Tuple[datetime, int], limit: int = SYNC_BATCH_SIZE):
+    # Keyset pagination on the (event_time, id) index: each call returns at most `limit`
+    # events after the cursor, so a large backlog is worked through in bounded batches. The id
+    # tie-breaker keeps events sharing the last timestamp of a full batch from being skipped.
     return (
         db.query(CADEvent)
-        .filter(CADEvent.event_time > last_synced)
-        .order_by(CADEvent.event_time)
+        .filter(tuple_(CADEvent.event_time, CADEvent.id) > tuple_(*last_synced))
+        .order_by(CADEvent.event_time, CADEvent.id)
+        .limit(limit)
         .all()
     )
 
 
-def create_skydio_marker(event: CADEvent):
-    # The marker-crud example uses /v0, but the .env default is /v1. We will use the default from the .env.
-    url = f"{SKYDIO_API_URL}/marker"
-    payload = {
+def load_cursor(db: Session) -> Optional[Tuple[datetime, int]]:
+    cursor = db.get(SyncCursor, CURSOR_NAME)
+    return (cursor.ts, cursor.last_id) if cursor else None
+
+
+def save_cursor(db: Session, cursor: Tuple[datetime, int]):
+    ts, last_id = cursor
+    db.merge(SyncCursor(name=CURSOR_NAME, ts=ts, last_id=last_id))
+    db.commit()
+
+
+def already_synced(event_id: int) -> bool:
+    synced_at = _recently_synced.get(event_id)
+    return synced_at is not None and time.monotonic() - synced_at < RECENTLY_SYNCED_TTL
+
+
+def remember_synced(event_id: int):
+    _recently_synced[event_id] = time.monotonic()
+    _recently_synced.move_to_end(event_id)
+    if len(_recently_synced) > RECENTLY_SYNCED_MAX:
+        _recently_synced.popitem(last=False)
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize obj to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def to_iso_utc(ts: datetime) -> str:
+    # SQLite hands back naive datetimes; event times are stored in UTC
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.isoformat()
+
+
+def build_marker_payload(event: CADEvent):
+    return {
         "title": event.title,
         "description": event.description,
-        "event_time": arrow.get(cast(datetime, event.event_time)).isoformat(),
+        "event_time": to_iso_utc(event.event_time),
         "latitude": event.latitude,
         "longitude": event.longitude,
         "type": event.type,
@@ -47,41 +146,90 @@ def create_skydio_marker(event: CADEvent):
             "incident_id": f"CAD-{event.id}",
         },
     }
+
+
+def post_marker(event_id: int, payload: dict) -> str:
+    # The marker-crud example uses /v0, but the .env default is /v1. We will use the default from the .env.
+    url = f"{SKYDIO_API_URL}/marker"
     try:
-        response = requests.post(url, headers=HEADERS, json=payload, timeout=10)
+        response = SESSION.post(url, data=dumps_json(payload), timeout=10)
         json_response = response.json()
         if "error" in json_response:
-            print(f"API Error for event {event.id}: {json_response['error']['msg']}")
-            return False
+            print(f"API Error for event {event_id}, not retrying: {json_response['error']['msg']}")
+            return REJECTED
 
-        print(f"Successfully created Skydio marker for event {event.id}.")
-        return True
+        print(f"Successfully created Skydio marker for event {event_id}.")
+        return CREATED
     except requests.exceptions.RequestException as e:
-        print(f"Error creating Skydio marker for event {event.id}: {e}")
-        return False
+        print(f"Error creating Skydio marker for event {event_id}: {e}")
+        return FAILED
+
+
+def create_skydio_marker(event: CADEvent):
+    return post_marker(event.id, build_marker_payload(event))
 
 
 def main():
     print("Starting sync service...")
+    init_db()  # Creates the sync_cursor table on databases initialized before it existed
     db = SessionLocal()
-    last_synced = datetime.now(timezone.utc)
-    print(f"Starting sync from timestamp: {last_synced.isoformat()}")
+    # Resume from the saved cursor so events created while the service was down still get synced
+    last_synced = load_cursor(db)
+    if last_synced is None:
+        last_synced = (datetime.now(timezone.utc), 0)
+        save_cursor(db, last_synced)
+    print(f"Starting sync from timestamp: {last_synced[0].isoformat()}")
+    interval = MIN_POLL_INTERVAL
     try:
         while True:
             events_to_sync = get_new_events(db, last_synced)
             if not events_to_sync:
                 print("No new events to sync. Waiting...")
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
             else:
+                interval = MIN_POLL_INTERVAL
+                batch_start = last_synced
+                # Read everything the workers need here: the ORM session must stay on this thread
+                jobs = []
                 for event in events_to_sync:
+                    if already_synced(event.id):
+                        print(f"Event {event.id} was already synced, skipping.")
+                        jobs.append((event.id, event.event_time, None))
+                        continue
                     print(f"Syncing event {event.id} created at {event.event_time}...")
-                    if create_skydio_marker(event):
-                        # Update the cursor to the timestamp of the last successfully synced event
-                        last_synced = event.event_time
-            time.sleep(2)  # Check for new events every 10 seconds
+                    jobs.append((event.id, event.event_time, build_marker_payload(event)))
+                results = EXECUTOR.map(
+                    lambda job: CREATED if job[2] is None else post_marker(job[0], job[2]), jobs
+                )
+                # The cursor only advances over the contiguous run of settled events at the start
+                # of the batch (map() yields results in submission order). Events after the first
+                # failure are fetched again next pass; the ones that did settle are skipped there
+                # by already_synced().
+                contiguous = True
+                for (event_id, event_time, _), outcome in zip(jobs, results):
+                    if outcome == FAILED:
+                        attempts = _failed_attempts.get(event_id, 0) + 1
+                        if attempts < MAX_POST_ATTEMPTS:
+                            _failed_attempts[event_id] = attempts
+                            contiguous = False
+                            continue
+                        print(f"Giving up on event {event_id} after {attempts} failed attempts.")
+                    _failed_attempts.pop(event_id, None)
+                    remember_synced(event_id)
+                    if contiguous:
+                        last_synced = (event_time, event_id)
+                if last_synced != batch_start:
+                    save_cursor(db, last_synced)  # One commit per batch
+                if len(events_to_sync) == SYNC_BATCH_SIZE and last_synced != batch_start:
+                    continue  # Full batch: more backlog is waiting, fetch it without sleeping
+            # +/-10% jitter keeps several sync services from polling in lockstep
+            time.sleep(interval * random.uniform(0.9, 1.1))
     except KeyboardInterrupt:
         print("\nStopping sync service.")
     finally:
         db.close()
+        EXECUTOR.shutdown()
+        SESSION.close()
 
 
 if __name__ == "__main__":